@@ -1,11 +1,23 @@
+import json
 import os
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
+import rubik.cache as cache
 import rubik.dispatch as dispatch
-from rubik.dispatch import _dispatch
+from rubik.dispatch import _batch, _batch_stream, _dispatch, _dispatch_stream
+from rubik.solve import TRUE_VALUES
 
 app = Flask(__name__)
 
+# Setting the 'stream' query parameter of /api or /api/batch answers with newline-delimited JSON, written as results are ready
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+# Every worker shares solutions through the on-disk cache, which also keeps them across restarts
+cache.configure_disk_cache(
+    os.getenv(cache.CACHE_DB_ENV, cache.DEFAULT_CACHE_DB),
+    int(os.getenv(cache.CACHE_DB_BYTES_ENV, cache.DEFAULT_DB_MAX_BYTES))
+)
+
 
 @app.route('/rubik')
 def server():
@@ -25,10 +37,29 @@ def server():
         return str(e)
 
 
+def _ndjson(results):
+    """ Write each result on its own line as it is produced, so the first result goes out before the rest are ready. """
+    for result in results:
+        yield json.dumps(result) + '\n'
+
+
+def _stream(results) -> Response:
+    res = Response(_ndjson(results), mimetype=NDJSON_MIMETYPE)
+    res.headers.add('Access-Control-Allow-Origin', '*')
+    return res
+
+
 @app.route('/api')
 def api():
+    """
+    Answers with the JSON result of the operation, or with ?stream=true a solve streams a line per phase:
+        /api?op=solve&cube=...&stream=true&states=true
+    """
     try:
-        result = _dispatch(dict(request.args.items()))
+        parms = dict(request.args.items())
+        if parms.pop('stream', None) in TRUE_VALUES:
+            return _stream(_dispatch_stream(parms))
+        result = _dispatch(parms)
         res = jsonify(result)
         res.headers.add('Access-Control-Allow-Origin', '*')
         print(f"Response --> {result}")
@@ -37,6 +68,29 @@ def api():
         return str(e)
 
 
+@app.route('/api/batch', methods=['POST'])
+def api_batch():
+    """
+    Handles many operations in one request, the body is a JSON array of parameter objects:
+        [{"op": "check", "cube": "..."}, {"op": "solve", "cube": "...", "rotate": "F"}]
+
+    The response is a JSON array holding the result of each object in order, as /api would return it. A batch of more than
+    RUBIK_BATCH_MAX_ITEMS objects (100 by default) is answered with a single error status instead.
+    With ?stream=true the results are instead written one per line as each object is done.
+    """
+    try:
+        items = request.get_json(silent=True)
+        if request.args.get('stream') in TRUE_VALUES:
+            return _stream(_batch_stream(items))
+        result = _batch(items)
+        res = jsonify(result)
+        res.headers.add('Access-Control-Allow-Origin', '*')
+        print(f"Response --> {len(result)} results" if isinstance(result, list) else f"Response --> {result}")
+        return res
+    except Exception as e:
+        return str(e)
+
+
 # -----------------------------------
 port = os.getenv('PORT', '5000')
 if __name__ == "__main__":
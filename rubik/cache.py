@@ -0,0 +1,268 @@
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from rubik.cube import CUBE_FACES, CUBE_PIECES, FACE_CENTERS, format_moves, parse_moves
+from rubik.symmetry import IDENTITY, Symmetry, canonicalize, restore_solution
+
+# Budgets for the in-process cache, whichever is reached first evicts the least recently used entries
+CACHE_ENTRIES_ENV = 'RUBIK_CACHE_ENTRIES'
+CACHE_BYTES_ENV = 'RUBIK_CACHE_BYTES'
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024
+
+# The on-disk cache shared by every worker process on the instance, it survives restarts until its file is removed
+CACHE_DB_ENV = 'RUBIK_CACHE_DB'
+CACHE_DB_BYTES_ENV = 'RUBIK_CACHE_DB_BYTES'
+DEFAULT_CACHE_DB = os.path.join(tempfile.gettempdir(), 'rubik-cache.sqlite3')
+DEFAULT_DB_MAX_BYTES = 64 * 1024 * 1024
+
+# The on-disk size is checked every this many writes, and eviction frees this fraction of the budget beyond the limit
+EVICTION_INTERVAL = 64
+EVICTION_SLACK = 0.1
+
+# A hit only records its use once the last record is this old, so that most reads never take the database write lock
+USED_REFRESH_SECONDS = 60.0
+
+# Bump whenever a solve method changes the solutions it returns, so that entries stored on disk by older versions are not served
+SOLUTION_KEY_VERSION = 5
+
+# Methods that may answer a cube with the solution of a symmetric cube share one entry between them. The layer method is left out
+# so that a cube always gets its own layer solution, whichever cubes were solved before it
+SYMMETRIC_METHODS = ('twophase', 'optimal')
+
+
+def normalize(cube) -> Optional[bytes]:
+    """ The cube with every color replaced by the index of the face whose center shares it (see Cube._remap_pieces), so that cubes
+        painted with other colors share a key. Returns None unless the cube is 54 ASCII letters and digits with six distinct centers.
+        Colors matching no center keep their character, which can never equal a face index, so an invalid cube never matches a valid one.
+    """
+    if not isinstance(cube, str) or len(cube) != CUBE_PIECES or not (cube.isascii() and cube.isalnum()):
+        return None
+    centers = bytes(ord(cube[index]) for index in FACE_CENTERS)
+    if len(set(centers)) != CUBE_FACES:
+        return None
+    return cube.encode('ascii').translate(bytes.maketrans(centers, bytes(range(CUBE_FACES))))
+
+
+def solution_key(cube, method: str) -> Optional[Tuple[bytes, Symmetry]]:
+    """ The cache key of a cube solved with a method, and the symmetry that carries the cube to the cached frame. """
+    faces = normalize(cube)
+    if faces is None:
+        return None
+    symmetry = IDENTITY
+    if method in SYMMETRIC_METHODS:
+        faces, symmetry = canonicalize(faces)
+    return f'{method}.v{SOLUTION_KEY_VERSION}:'.encode('ascii') + faces, symmetry
+
+
+class SolutionCache:
+    """
+    A thread-safe LRU map from keys to solutions, bounded by both an entry count and an approximate size in bytes.
+    Hit and miss counts are kept for monitoring.
+    """
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_environment(cls) -> 'SolutionCache':
+        return cls(
+            int(os.environ.get(CACHE_ENTRIES_ENV, DEFAULT_MAX_ENTRIES)),
+            int(os.environ.get(CACHE_BYTES_ENV, DEFAULT_MAX_BYTES))
+        )
+
+    @staticmethod
+    def _size(key: bytes, value: str) -> int:
+        return sys.getsizeof(key) + sys.getsizeof(value)
+
+    def get(self, key: bytes) -> Optional[str]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: bytes, value: str):
+        size = self._size(key, value)
+        with self._lock:
+            if size > self.max_bytes:
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= self._size(key, previous)
+            self._entries[key] = value
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                evicted_key, evicted = self._entries.popitem(last=False)
+                self._bytes -= self._size(evicted_key, evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    @property
+    def size(self) -> int:
+        """ Approximate bytes held by keys and solutions. """
+        return self._bytes
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class DiskCache:
+    """
+    A key to value map in a SQLite database in WAL mode, so that every worker process can read while another writes.
+    Entries record when they were last used, to within USED_REFRESH_SECONDS, and once their total size passes max_bytes the least
+    recently used are deleted. The cache is best effort: database errors are treated as misses, lost writes, and an empty cache.
+    Only opening the database raises sqlite3.Error, see configure_disk_cache.
+    """
+    def __init__(self, path: str, max_bytes: int = DEFAULT_DB_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+        with self._connection() as connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS entries (key BLOB PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, used REAL NOT NULL)'
+            )
+            connection.execute('CREATE INDEX IF NOT EXISTS entries_used ON entries (used)')
+
+    def _connection(self) -> sqlite3.Connection:
+        """ SQLite connections cannot be shared between threads, so each thread opens its own. """
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5.0)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    def get(self, key: bytes) -> Optional[str]:
+        try:
+            with self._connection() as connection:
+                row = connection.execute('SELECT value, used FROM entries WHERE key = ?', (key,)).fetchone()
+                now = time.time()
+                if row is not None and now - row[1] >= USED_REFRESH_SECONDS:
+                    connection.execute('UPDATE entries SET used = ? WHERE key = ?', (now, key))
+        except sqlite3.Error:
+            return None
+        return None if row is None else row[0]
+
+    def put(self, key: bytes, value: str):
+        try:
+            with self._connection() as connection:
+                connection.execute(
+                    'INSERT OR REPLACE INTO entries (key, value, size, used) VALUES (?, ?, ?, ?)',
+                    (key, value, len(key) + len(value), time.time())
+                )
+        except sqlite3.Error:
+            return
+        with self._writes_lock:
+            self._writes += 1
+            evict = self._writes % EVICTION_INTERVAL == 0
+        if evict:
+            self.evict()
+
+    def evict(self):
+        """ Once the total size passes the budget, delete the least recently used entries until it is back under, less some slack. """
+        try:
+            self._evict()
+        except sqlite3.Error:
+            pass
+
+    def _evict(self):
+        with self._connection() as connection:
+            size = connection.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+            if size <= self.max_bytes:
+                return
+            excess = size - self.max_bytes * (1 - EVICTION_SLACK)
+            evicted = []
+            for key, entry_size in connection.execute('SELECT key, size FROM entries ORDER BY used, rowid'):
+                if excess <= 0:
+                    break
+                evicted.append((key,))
+                excess -= entry_size
+            connection.executemany('DELETE FROM entries WHERE key = ?', evicted)
+
+    @property
+    def size(self) -> int:
+        """ Total bytes held by keys and values, 0 when the database cannot be read. """
+        try:
+            with self._connection() as connection:
+                return connection.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+        except sqlite3.Error:
+            return 0
+
+    def __len__(self):
+        try:
+            with self._connection() as connection:
+                return connection.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+        except sqlite3.Error:
+            return 0
+
+
+SOLUTIONS = SolutionCache.from_environment()
+DISK = None
+
+
+def configure_disk_cache(path: Optional[str], max_bytes: int = DEFAULT_DB_MAX_BYTES) -> Optional[DiskCache]:
+    """ Share solutions through a database at path, or stop using the disk when path is None.
+        A database that cannot be opened, being unwritable or corrupt, leaves this process with its memory cache only.
+    """
+    global DISK
+    try:
+        DISK = DiskCache(path, max_bytes) if path else None
+    except (sqlite3.Error, OSError):
+        DISK = None
+    return DISK
+
+
+def _get(key: bytes) -> Optional[str]:
+    """ Look in this process first and then on disk, keeping what another worker stored for the next request. """
+    value = SOLUTIONS.get(key)
+    if value is None and DISK is not None:
+        value = DISK.get(key)
+        if value is not None:
+            SOLUTIONS.put(key, value)
+    return value
+
+
+def _put(key: bytes, value: str):
+    SOLUTIONS.put(key, value)
+    if DISK is not None:
+        DISK.put(key, value)
+
+
+def get_solution(cube, method: str) -> Optional[str]:
+    """ A cached solution for the cube, mapped back from the cached frame, or None. """
+    key = solution_key(cube, method)
+    if key is None:
+        return None
+    solution = _get(key[0])
+    return None if solution is None else restore_solution(solution, key[1])
+
+
+def put_solution(cube, method: str, solution: str):
+    """ Cache the solution of a cube that has been checked and solved, stored in the cached frame of the cube. """
+    key = solution_key(cube, method)
+    if key is not None:
+        _put(key[0], format_moves(key[1].apply_moves(parse_moves(solution))))
+
@@ -1,4 +1,5 @@
 import rubik.cube as rubik
+from rubik.coordinates import check_solvable
 from rubik.cube import CubeError
 
 
@@ -12,15 +13,15 @@ def _check(parms):
            has 9 occurrences of 6 colors
            has each middle face being a different color
 
-        Otherwise, we return the relevant error
+           can be solved: no twisted corner, flipped edge, swapped pair, or repeated piece
 
-        EC:
-            Find out if cube contains contradictory colors
+        Otherwise, we return the relevant error
 
         @return dict: {'status': 'ok'} or {'status': 'error: xxx'}
     """
+    cube = parms.get('cube')
     try:
-        _ = rubik.Cube(parms.get('cube'))
+        check_solvable(rubik.validate_cube(cube), cube)
     except CubeError as e:
         return {'status': str(e)}
     except Exception as e:
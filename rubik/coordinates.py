@@ -0,0 +1,236 @@
+from dataclasses import dataclass
+from math import factorial
+from operator import itemgetter
+from typing import Sequence, Tuple
+
+from rubik.cube import CUBE_PIECES, CubeArrangement, CubeFace, PieceType, Cube, MOVE_TABLES
+from rubik.utils.exceptions import (
+    InvalidCubeConfiguration, InvalidCubeCorner, InvalidCubeDuplicatePieces, InvalidCubeEdge, InvalidCubeFlip, InvalidCubeParity,
+    InvalidCubeTwist
+)
+
+# Corner and edge positions are numbered in CubeArrangement order (CORNER_A..CORNER_H, EDGE_A..EDGE_L)
+CORNERS = tuple(arrangement for arrangement in CubeArrangement if arrangement.name.startswith(PieceType.CORNER.value))
+EDGES = tuple(arrangement for arrangement in CubeArrangement if arrangement.name.startswith(PieceType.EDGE.value))
+
+# Orientation is measured from a reference facelet, the U or D facelet of a corner, and the U or D (otherwise F or B) facelet of an edge
+CORNER_REFERENCE_FACES = (CubeFace.U.value, CubeFace.D.value)
+EDGE_REFERENCE_FACES = (CubeFace.U.value, CubeFace.D.value, CubeFace.F.value, CubeFace.B.value)
+
+
+def _reference_first(arrangement: CubeArrangement, reference_faces) -> Tuple[int, ...]:
+    """ Rotate the facelets of a piece so the reference facelet comes first while keeping their clockwise order.
+        Reference faces are listed by priority, so an edge uses its U/D facelet when it has one.
+    """
+    indexes = arrangement.true_indexes
+    faces = [index // 9 for index in indexes]
+    offset = faces.index(next(face for face in reference_faces if face in faces))
+    return tuple(indexes[offset:] + indexes[:offset])
+
+
+# Facelet indexes of each position, reference facelet first
+CORNER_FACELETS = tuple(_reference_first(arrangement, CORNER_REFERENCE_FACES) for arrangement in CORNERS)
+EDGE_FACELETS = tuple(_reference_first(arrangement, EDGE_REFERENCE_FACES) for arrangement in EDGES)
+
+# Faces of each piece in the same order, which is also the color order of each cubie when it is solved
+CORNER_COLORS = tuple(tuple(index // 9 for index in facelets) for facelets in CORNER_FACELETS)
+EDGE_COLORS = tuple(tuple(index // 9 for index in facelets) for facelets in EDGE_FACELETS)
+
+# The colors read at a position, reference facelet first, for every piece in every orientation, mapped to (piece, orientation).
+# Mirrored corners have no entry.
+ORIENTED_CORNERS = {
+    tuple(colors[(x - twist) % 3] for x in range(3)): (corner, twist) for corner, colors in enumerate(CORNER_COLORS) for twist in range(3)
+}
+ORIENTED_EDGES = {
+    colors[flip:] + colors[:flip]: (edge, flip) for edge, colors in enumerate(EDGE_COLORS) for flip in range(2)
+}
+CORNER_GATHERS = tuple(itemgetter(*facelets) for facelets in CORNER_FACELETS)
+EDGE_GATHERS = tuple(itemgetter(*facelets) for facelets in EDGE_FACELETS)
+
+N_TWIST = 3 ** 7
+N_FLIP = 2 ** 11
+N_CORNER_PERMUTATION = factorial(8)
+N_EDGE_PERMUTATION = factorial(12)
+
+
+def rank_permutation(permutation: Sequence[int]) -> int:
+    """ Rank a permutation in lexicographic order (its Lehmer code). """
+    rank = 0
+    size = len(permutation)
+    for x in range(size):
+        smaller = sum(1 for y in range(x + 1, size) if permutation[y] < permutation[x])
+        rank = rank * (size - x) + smaller
+    return rank
+
+
+def unrank_permutation(rank: int, size: int) -> Tuple[int, ...]:
+    """ Rebuild the permutation of the given size from its lexicographic rank. """
+    digits = []
+    for base in range(1, size + 1):
+        rank, digit = divmod(rank, base)
+        digits.append(digit)
+    remaining = list(range(size))
+    return tuple(remaining.pop(digit) for digit in reversed(digits))
+
+
+def permutation_parity(permutation: Sequence[int]) -> int:
+    """ Return 0 for an even permutation and 1 for an odd one, which is when its size and its number of cycles differ by an odd number. """
+    seen = [False] * len(permutation)
+    cycles = 0
+    for start in range(len(permutation)):
+        if not seen[start]:
+            cycles += 1
+            position = start
+            while not seen[position]:
+                seen[position] = True
+                position = permutation[position]
+    return (len(permutation) - cycles) % 2
+
+
+def check_solvable(faces: Sequence[int], problem_cube=None):
+    """ Raise the matching cube error unless face turns can solve a cube given as a face index per facelet (see Cube.face_map).
+        See CubieCube.from_faces and CubieCube.check for the rules.
+    """
+    CubieCube.from_faces(faces, problem_cube).check(problem_cube)
+
+
+@dataclass(frozen=True)
+class CubieCube:
+    """
+    Models a cube by its pieces rather than its facelets.
+
+    cp: the corner found at each corner position
+    co: the twist of each corner, 0 when its U/D color is on the U/D face of the position, otherwise 1 or 2 turns clockwise
+    ep: the edge found at each edge position
+    eo: the flip of each edge, 0 when its reference color is on the reference facelet of the position
+    """
+    cp: Tuple[int, ...]
+    co: Tuple[int, ...]
+    ep: Tuple[int, ...]
+    eo: Tuple[int, ...]
+
+    @classmethod
+    def from_faces(cls, faces: Sequence[int], problem_cube=None) -> 'CubieCube':
+        """ Read the pieces from a face index per facelet (see Cube.face_map).
+            Pieces whose colors are not those of a real corner or edge, including mirrored corners, raise the matching cube error.
+        """
+        problem_cube = faces if problem_cube is None else problem_cube
+        corners = [ORIENTED_CORNERS.get(gather(faces)) for gather in CORNER_GATHERS]
+        if None in corners:
+            raise InvalidCubeCorner(problem_cube)
+        edges = [ORIENTED_EDGES.get(gather(faces)) for gather in EDGE_GATHERS]
+        if None in edges:
+            raise InvalidCubeEdge(problem_cube)
+        cp, co = zip(*corners)
+        ep, eo = zip(*edges)
+        return cls(cp, co, ep, eo)
+
+    @classmethod
+    def from_cube(cls, cube: Cube) -> 'CubieCube':
+        return cls.from_faces(cube.face_map)
+
+    @classmethod
+    def from_coordinates(cls, twist: int, flip: int, corner_permutation: int, edge_permutation: int) -> 'CubieCube':
+        """ Build a cube from its four coordinates, the last twist and flip are implied by the others. """
+        co = []
+        for _ in range(7):
+            twist, value = divmod(twist, 3)
+            co.append(value)
+        co.reverse()
+        co.append(-sum(co) % 3)
+        eo = []
+        for _ in range(11):
+            flip, value = divmod(flip, 2)
+            eo.append(value)
+        eo.reverse()
+        eo.append(sum(eo) % 2)
+        return cls(unrank_permutation(corner_permutation, 8), tuple(co), unrank_permutation(edge_permutation, 12), tuple(eo))
+
+    @classmethod
+    def from_packed(cls, packed: int) -> 'CubieCube':
+        packed, flip = divmod(packed, N_FLIP)
+        packed, edge_permutation = divmod(packed, N_EDGE_PERMUTATION)
+        corner_permutation, twist = divmod(packed, N_TWIST)
+        return cls.from_coordinates(twist, flip, corner_permutation, edge_permutation)
+
+    def to_faces(self) -> Tuple[int, ...]:
+        """ Write the pieces back out as a face index per facelet. """
+        faces = [index // 9 for index in range(CUBE_PIECES)]
+        for facelets, corner, twist in zip(CORNER_FACELETS, self.cp, self.co):
+            for x, color in enumerate(CORNER_COLORS[corner]):
+                faces[facelets[(x + twist) % 3]] = color
+        for facelets, edge, flip in zip(EDGE_FACELETS, self.ep, self.eo):
+            for x, color in enumerate(EDGE_COLORS[edge]):
+                faces[facelets[(x + flip) % 2]] = color
+        return tuple(faces)
+
+    def to_string(self, colors: str = '012345') -> str:
+        """ Write the pieces back out as a cube string, using one color character per face. """
+        return "".join(colors[face] for face in self.to_faces())
+
+    def multiply(self, other: 'CubieCube') -> 'CubieCube':
+        """ The cube reached by applying the moves that produce other to this cube. """
+        return CubieCube(
+            tuple(self.cp[position] for position in other.cp),
+            tuple((self.co[position] + twist) % 3 for position, twist in zip(other.cp, other.co)),
+            tuple(self.ep[position] for position in other.ep),
+            tuple((self.eo[position] + flip) % 2 for position, flip in zip(other.ep, other.eo)),
+        )
+
+    def move(self, code: int) -> 'CubieCube':
+        return self.multiply(MOVE_CUBIES[code])
+
+    @property
+    def twist(self) -> int:
+        twist = 0
+        for value in self.co[:7]:
+            twist = twist * 3 + value
+        return twist
+
+    @property
+    def flip(self) -> int:
+        flip = 0
+        for value in self.eo[:11]:
+            flip = flip * 2 + value
+        return flip
+
+    @property
+    def corner_permutation(self) -> int:
+        return rank_permutation(self.cp)
+
+    @property
+    def edge_permutation(self) -> int:
+        return rank_permutation(self.ep)
+
+    def check(self, problem_cube=None):
+        """ Raise the matching cube error unless face turns can solve the cube. Every piece must appear once, the corner twists must
+            add up to a multiple of 3, the edge flips to a multiple of 2, and the corner and edge permutations must be both even or both
+            odd: twisted corners, flipped edges, or a single swap of two pieces can never be undone by face turns.
+        """
+        if len(set(self.cp)) != len(self.cp) or len(set(self.ep)) != len(self.ep):
+            raise InvalidCubeDuplicatePieces(problem_cube)
+        if sum(self.co) % 3:
+            raise InvalidCubeTwist(problem_cube)
+        if sum(self.eo) % 2:
+            raise InvalidCubeFlip(problem_cube)
+        if permutation_parity(self.cp) != permutation_parity(self.ep):
+            raise InvalidCubeParity(problem_cube)
+
+    @property
+    def solvable(self) -> bool:
+        try:
+            self.check()
+        except InvalidCubeConfiguration:
+            return False
+        return True
+
+    def pack(self) -> int:
+        """ All four coordinates packed into a single integer. """
+        return ((self.corner_permutation * N_TWIST + self.twist) * N_EDGE_PERMUTATION + self.edge_permutation) * N_FLIP + self.flip
+
+
+SOLVED_CUBIE = CubieCube(tuple(range(8)), (0,) * 8, tuple(range(12)), (0,) * 12)
+SOLVED_FACES = SOLVED_CUBIE.to_faces()
+
+# Every face turn expressed on pieces, read from the facelet move tables so both representations always agree
+MOVE_CUBIES = tuple(CubieCube.from_faces([SOLVED_FACES[index] for index in table]) for table in MOVE_TABLES)
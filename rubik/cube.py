@@ -1,7 +1,9 @@
 from dataclasses import dataclass
-import re
+from bisect import bisect_right
 from enum import Enum, unique
-from typing import List, Set
+from functools import lru_cache
+from operator import itemgetter
+from typing import List, Set, Tuple
 from rubik.utils.exceptions import *
 
 CUBE_PIECES = 54
@@ -90,44 +92,51 @@ class CubeArrangement(Enum):
     @staticmethod
     def get_arrangement_from_element(index):
         """ Locate a piece if we know any one of the elements. Index parameter is zero based. """
-        for arrangement in CubeArrangement:
-            if arrangement.name != 'PieceArrangement' and index in arrangement.true_indexes:
-                return arrangement
+        if 0 <= index < CUBE_PIECES:
+            return ELEMENT_ARRANGEMENTS[index]
         return None
 
     @staticmethod
     def is_valid_adjacency(adjacencies):
         """ Obtain an arrangement from a set of adjacencies. """
-        for arrangement in CubeArrangement:
-            if arrangement.name != 'PieceArrangement' and adjacencies == arrangement.adjacencies:
-                return arrangement
-        return None
+        return ADJACENCY_ARRANGEMENTS.get(frozenset(adjacencies))
 
     @staticmethod
     def get_cohesive_pieces(pieces, color_index, piece_type: PieceType):
-        """ Return all the valid edges or corners for the color index. """
-        return list(
-            filter(
-                lambda v: (v.value == color_index) and (v.arrangement.piece_type == piece_type.value),
-                pieces
-            )
-        )
+        """ Return all the valid edges or corners for the color index. The full list of 54 pieces is expected. """
+        return [pieces[index] for index in TYPE_ELEMENTS[piece_type.value] if pieces[index].value == color_index]
 
     @staticmethod
     def get_face_pieces(pieces, face: int, piece_type: PieceType):
-        """ Return all the valid edges or corners for this face. """
-        pieces = list(
-            filter(
-                lambda v: (v.index // CUBE_FACE_PIECES == face) and v.arrangement.piece_type == piece_type.value,
-                pieces
-            )
-        )
-        return sorted(pieces, key=lambda v: v.rm_index)
+        """ Return all the valid edges or corners for this face in row-major order. The full list of 54 pieces is expected. """
+        return [pieces[index] for index in FACE_TYPE_ELEMENTS[face, piece_type.value]]
 
     def __repr__(self):
         return f"{self.name}, indexes={self.value.true_indexes}, adjacencies={self.value.adjacencies}"
 
 
+# Arrangement lookups run for every facelet of every cube, so they are indexed once at import
+ELEMENT_ARRANGEMENTS = tuple(
+    next(
+        arrangement for arrangement in CubeArrangement
+        if arrangement.name != 'PieceArrangement' and index in arrangement.true_indexes
+    )
+    for index in range(CUBE_PIECES)
+)
+ADJACENCY_ARRANGEMENTS = {
+    frozenset(arrangement.adjacencies): arrangement
+    for arrangement in CubeArrangement if arrangement.name != 'PieceArrangement'
+}
+TYPE_ELEMENTS = {
+    piece_type.value: tuple(index for index, arrangement in enumerate(ELEMENT_ARRANGEMENTS) if arrangement.piece_type == piece_type.value)
+    for piece_type in PieceType
+}
+FACE_TYPE_ELEMENTS = {
+    (face, piece_type): tuple(index for index in elements if index // CUBE_FACE_PIECES == face)
+    for piece_type, elements in TYPE_ELEMENTS.items()
+    for face in range(CUBE_FACES)
+}
+
 
 @dataclass
 class HeuristicsProperties:
@@ -151,6 +160,13 @@ class HeuristicsProperties:
     success_metric: list
 
 
+class CandidateStatus(Enum):
+    """ The outcome of looking for candidates on one face of a heuristic phase. """
+    FOUND = "FOUND"                 # candidates were found and an algorithm should be chosen for them
+    FACE_SOLVED = "FACE_SOLVED"     # nothing is left to do on this face, move to the next one
+    PHASE_SOLVED = "PHASE_SOLVED"   # nothing is left to do in this phase
+
+
 class CubeHeuristics(Enum):
     """ This enumeration is used as a container for all phases of operations needing heuristic or algorithmic analysis used to solve a cube.
         Each phase is constructed using the HeuristicProperties dataclass, and should be self sufficient to solve any input cube given a list of candidates.
@@ -169,7 +185,7 @@ class CubeHeuristics(Enum):
             ],
             'L': [
                 ['Lfl', 'LLfll', 'lf'],
-                ['LuLFF', 'lulFF', 'luFF', 'uFF']
+                ['LuLFF', 'lulFF', 'luFF', 'uFF', 'LLuFF']
             ],
             'U' : [
                 ['UUFF'],
@@ -258,6 +274,21 @@ class CubeHeuristics(Enum):
             CubeArrangement.EDGE_D
         ]
     )
+    LastLayer = HeuristicsProperties(
+        order=3,
+        pieces_to_set=8,
+        heuristics={
+            # Sequences that leave the first two layers in place, the orientation ones can reach every top layer orientation and the
+            # permutation ones every top layer permutation while keeping the top face oriented
+            'OLL': ['RUrURUUr', 'FRUruf', 'FURurf'],
+            'PLL': ['RUrurFRRuruRUrf', 'RuRURURuruRR'],
+        },
+        adjustment_rotations=['U'],
+        adjustment_exclusion=[],
+        translation_parameters={},
+        arrangement_heuristic={},
+        success_metric=[]
+    )
 
     def get_operation(self, face, target):
         """ Utility wrapper for less verbose access to data. """
@@ -266,143 +297,51 @@ class CubeHeuristics(Enum):
     def get_algorithm_by_arrangement(self, candidates, target, reference_face):
         """ Takes in a list of candidates, the target face, and the reference value, and returns one or more algorithms that will be 
             pertinent in solving a single candidat on the current phase given a list of potential candidates. The most likely of which is
-            chosen to be solved based on context.
+            chosen to be solved based on context. The algorithms for every piece location and target face are compiled at import
+            (see _compile_bottom_cross, _compile_lower_layer, and _compile_middle_layer), so this only picks the candidate and looks it up.
+            Returns None when no candidate belongs on the target face, which means the face is already solved.
         """
         # The heuristic we will try
         if self.name == "BottomCross":
             # Find a candidate for this piece
-            candidate_order, candidate = self.locate_match(candidates, self.value.success_metric[target])
-            
-            # If the piece is already on the front of the cube, perform adjustment moves to correct
-            for face in self.value.arrangement_heuristic:
-                if any(f'EDGE_{point}' in candidate.arrangement.name for point in self.get_operation(face, target)):
-                    alt = self.value.translation_parameters[face](candidate.current_face, target)
-                    return CubeHeuristics.translate_heuristics(
-                        self.value.heuristics[face][alt],
-                        target,
-                        ['']
-                    ), self.value.success_metric[target]
+            match = self.locate_match(candidates, self.value.success_metric[target])
+            if match is None:
+                return None
+            candidate_order, candidate = match
+            return BOTTOM_CROSS_ALGORITHMS.get((candidate.index, target))
         elif self.name == "LowerLayer":
-            # Find a candidate for this piece
-            candidate_order, candidate = self.locate_match(candidates, self.value.success_metric[target])
-
-            # Check if we're below and need adjustments to raise to top, or if we're above
-            if candidate.arrangement in self.value.success_metric:
-                # Candidate piece is at the bottom of the cube
-                lift_heur = self.value.heuristics['LIFT'][candidate_order][0]
-                rot_heur = "" + "U" * ((3 + candidate_order - target) % 4)
-                
-                face = ""
-                if candidate.current_face == 5:
-                    face = "F"
-                elif candidate.rm_index == 7:
-                    face = "R"
-                elif candidate.rm_index == 9:
-                    face = 'U'
-
-                adj_heur = CubeHeuristics.translate_heuristics(
-                    self.value.heuristics[face],
-                    target,
-                    ['']
-                )
-
-                # Combine lift, rotation, and adjustment heuristics
-                print(f"Unrotated: {self.minimize(f'{lift_heur}{rot_heur}{self.value.heuristics[face][0]}')}")
-                return [self.minimize(f"{lift_heur}{rot_heur}{adj_heur[0]}")], self.value.success_metric[target]
-            else:
-                # Find out how many spaces we need to rotate the top to line up with the bottom piece
-                heur = self.value.heuristics['F'][0]
-                candidate_order = candidate.current_face
-                if candidate.current_face == 4:
-                    heur = self.value.heuristics['U'][0]
-                    if candidate.rm_index == 1:
-                        candidate_order = 2
-                    elif candidate.rm_index == 3:
-                        candidate_order = 1
-                    elif candidate.rm_index == 9:
-                        candidate_order = 0
-                    else:
-                        candidate_order = 3
-                elif candidate.rm_index == 1:
-                    # Red piece on right-hand side
-                    heur = self.value.heuristics['R'][0]
-                    candidate_order = (3 + candidate.current_face) % 4
-
-                # Figure out the number of rotations needed to adjust cube
-                rot_heur = "" + "U" * ((4 + candidate_order - target) % 4)
-
-                # Apply rotations in context with the current face
-                print(f"Unrotated: {self.minimize(f'{rot_heur}{heur}')}")
-                return CubeHeuristics.translate_heuristics(
-                        [self.minimize(f"{rot_heur}{heur}")],
-                        target,
-                        ['']
-                    ), self.value.success_metric[target]
+            # Find a candidate for this piece, the lift or rotation needed follows from where it sits
+            match = self.locate_match(candidates, self.value.success_metric[target])
+            if match is None:
+                return None
+            candidate_order, candidate = match
+            unrotated, algorithm = LOWER_LAYER_ALGORITHMS[candidate.index, target]
+            print(f"Unrotated: {unrotated}")
+            return [algorithm], self.value.success_metric[target]
         elif self.name == "MiddleLayer":
             for candidate in candidates:
-                # Assume no rotations and that the moves are not lifting moves
-                rot = ""
-                lift = False
-                heur = ['']
-                
-                # Mark as lifting move if piece being moved is one in a middle layer or is on top and has the top color within it
-                if candidate.arrangement in [CubeArrangement.EDGE_B, CubeArrangement.EDGE_F, CubeArrangement.EDGE_I, CubeArrangement.EDGE_D]:
-                    lift = True
-                elif 4 in list(candidate.adjacent_faces):
-                    lift = True
-                
-                # Only apply rotations if the target face is different than the current face
-                if candidate.current_face != target:
-                    rot += "u" * (((target - candidate.current_face) + 4) % 4)
-                
-                # Decide which rotation should be made
-                left_side = ((target - 1) + 4) % 4
-                right_side = ((target + 1) + 4) % 4
-                if left_side in list(candidate.adjacent_faces):
-                    heur = self.value.heuristics['L']
-                    adj_heur = CubeHeuristics.translate_heuristics(
-                        heur,
-                        target,
-                        [rot]
-                    )
-                    return [self.minimize(adj_heur[0])], self.value.success_metric[left_side] if not lift else None
-                elif right_side in list(candidate.adjacent_faces):
-                    heur = self.value.heuristics['R']
-                    adj_heur = CubeHeuristics.translate_heuristics(
-                        heur,
-                        target,
-                        [rot]
-                    )
-                    return [self.minimize(adj_heur[0])], self.value.success_metric[target] if not lift else None
+                # Candidates touching neither side of the target face have no algorithm
+                algorithm = MIDDLE_LAYER_ALGORITHMS.get((candidate.index, frozenset(candidate.adjacent_faces), target))
+                if algorithm is not None:
+                    return algorithm
             return [''], None
-
+        elif self.name == "LastLayer":
+            # The candidates are the top layer facelets, whose faces give the pattern to look up
+            algorithm = last_layer_algorithm(tuple(candidate.home_face for candidate in candidates))
+            if algorithm is None:
+                return None
+            return [algorithm], None
 
     @staticmethod
     def minimize(moves: str):
-        """ The last step before returning the algorithm is minimization of the output rotations list
-            Values that are minimized include:
-                XXX --> x
-                xxx --> X
-                Xx  --> Remove
-                xX  --> Remove
-                
-            This function does NOT recursively minimize, however, so values such as 
-                XXxxXXxx
-            do not get minimized, the expectation is that the algorithm selection doesn't lead to strings like this, and if it might,
-            this function can be called in segments or wrapped several times.
+        """ The last step before returning the algorithm is minimization of the output rotations list, which merges and cancels
+            turns of the same face, including across turns of the opposite face. See simplify_moves.
         """
-        letters = ["f", "u", "r", "l", "b", "d"]
-        for letter in letters:
-            inverse_letter = str.swapcase(letter)
-            moves = moves\
-                .replace(letter * 3, inverse_letter)\
-                .replace(inverse_letter * 3, letter)\
-                .replace(letter + inverse_letter, "")\
-                .replace(inverse_letter + letter, "")
-        return moves
+        return simplify_moves(moves)
 
     def locate_match(self, candidates, current_face):
         """ This function is concerned with picking out the component that exactly matches the one we're looking to insert.
+            Returns the candidate with its order, or None when no candidate matches.
             current_face: the current orientation from which we're visualizing the cube, needed to make sure we get the right index.
             reference_face: the block we're comparing against and trying to find a solution for
         """
@@ -419,80 +358,51 @@ class CubeHeuristics(Enum):
                 except ValueError:
                     pass
                 return x, candidate
-        else:
-            # This indicates this face is already solved as there is no candidate
-            raise FaceAlreadySolved()
+
+        # This indicates this face is already solved as there is no candidate
+        return None
 
     @staticmethod
     def translate_heuristics(heuristics, face, adjustment_rotations):
         """ Receives in a series of heuristics and applies transformations in context of a target face.
             It also applies a series of adjustment rotations to each heuristic if several must be tested to find the correct one.
         """
-        transformed_heuristics = []
-        for heuristic in heuristics:
-            
-            # Add each value in the adjustment patterns group to the beginning of each of the algorithms
-            for adjustment_pattern in adjustment_rotations:
-                new_heuristic = ''
-                
-                # Ensure that both the adjustment pattern and the heuristic both get translations applied to them
-                for command in (adjustment_pattern + heuristic):
-                    translated_heuristic = CubeFace.translate_rotation(command, face)
-                    
-                    # Determine direction by upper/lowercase ascii value
-                    if ord(command) >= 97:
-                        translated_heuristic = translated_heuristic.lower()
-                    new_heuristic += translated_heuristic
-                
-                # Add transformed and padded heuristic back to list
-                transformed_heuristics.append(new_heuristic)
-        return transformed_heuristics
+        # Ensure that both the adjustment pattern and the heuristic both get translations applied to them
+        translation = ROTATION_TRANSLATIONS[face]
+        return [
+            (adjustment_pattern + heuristic).translate(translation)
+            for heuristic in heuristics
+            for adjustment_pattern in adjustment_rotations
+        ]
 
     def get_pieces_solved(self, faces, pieces):
         """ Ensures that for a given phase, all piece types matching a face or group of faces match 
             the expected values to verify the phase solution. 
         """
         if self.name == 'BottomCross':
-            return list(
-                filter(
-                    lambda v:
-                        v.value == faces.D.center.value and v.arrangement.piece_type == 'EDGE',
-                        pieces[45:53]
-                )
-            ).__len__()
+            color = faces.D.center.value
+            return sum(pieces[index].value == color for index in FACE_EDGES[CubeFace.D.value])
         elif self.name == "LowerLayer":
-            return list(
-                filter(
-                    lambda v:
-                        v.value == faces.D.center.value and v.arrangement.piece_type == 'CORNER',
-                        pieces[45:54]
-                )
-            ).__len__()
+            color = faces.D.center.value
+            return sum(pieces[index].value == color for index in FACE_CORNERS[CubeFace.D.value])
         elif self.name == "MiddleLayer":
-            pieces = list(
-                filter(
-                    lambda v: (
-                        v.value == faces.F.center.value or
-                        v.value == faces.R.center.value or
-                        v.value == faces.B.center.value or
-                        v.value == faces.L.center.value
-                    ) and v.arrangement.piece_type == 'EDGE',
-                    [pieces[5], pieces[12], pieces[14], pieces[21], pieces[23], pieces[30], pieces[32], pieces[3]]
-                )
+            # A middle edge is only set when both of its colors match the faces they sit on
+            return sum(
+                all(pieces[index].value == faces[face].center.value for index, face in slot)
+                for slot in MIDDLE_LAYER_SLOTS.values()
             )
-            if int(pieces.__len__() / 2):
-                # Double check work to make sure order matches as well
-                if (pieces[-1].value == faces.F.center.value and pieces[0].value  == faces.F.center.value and
-                    pieces[1].value  == faces.R.center.value and pieces[2].value  == faces.R.center.value and
-                    pieces[3].value  == faces.B.center.value and pieces[4].value  == faces.B.center.value and
-                    pieces[6].value  == faces.L.center.value and pieces[6].value  == faces.L.center.value
-                    ):
-                    return 4
-
-    def get_candidates(self, faces, pieces, targeted=None):
+        elif self.name == "LastLayer":
+            return sum(
+                all(pieces[index].home_face == index // CUBE_FACE_PIECES for index in piece)
+                for piece in LAST_LAYER_PIECES
+            )
+
+    def get_candidates(self, faces, pieces, targeted=None, phase_solved=None):
         """ Obtain all possible piece candidates for insertion in no particular order.
             This function takes an array of faces and pieces to find pieces of the same color, orientation, and type.
             Functionality can be overridden based on the current phase for maximum flexibility
+            Returns a CandidateStatus along with the candidates, which are only given when the status is FOUND.
+            phase_solved: whether every piece of the phase is set, when the caller keeps track of it (see Cube.phase_solved)
         """
         possibilities = []
         if self.name == 'BottomCross':
@@ -525,67 +435,54 @@ class CubeHeuristics(Enum):
                 possibilities.append(possibility)
         elif self.name == 'MiddleLayer':
             # Exit phase if all pieces are solved
-            if self.get_pieces_solved(faces, pieces) == 4:
-                raise PhaseAlreadySolved()
+            if phase_solved is None:
+                phase_solved = self.get_pieces_solved(faces, pieces) == self.value.pieces_to_set
+            if phase_solved:
+                return CandidateStatus.PHASE_SOLVED, []
             
             # Naively find all cube pieces matching the targeted face color
             preliminary = CubeArrangement.get_cohesive_pieces(
                 pieces,
-                list(faces)[targeted].center.value,
+                faces[targeted].center.value,
                 PieceType.EDGE
             )
             
-            # Filter through preliminary pieces to exclude those that have the top color on them and those matching bottom edges
-            filtered_preliminary = []
+            # Exclude pieces that have the top color on them and those matching bottom edges, then look up the middle slot the piece
+            # belongs in, which is only a candidate for the two faces it borders
             for possibility in preliminary:
-                possibility_faces = list(possibility.adjacent_faces)
-                if (4 not in possibility_faces and
-                    possibility.arrangement not in [
-                        CubeArrangement.EDGE_C,
-                        CubeArrangement.EDGE_G,
-                        CubeArrangement.EDGE_J,
-                        CubeArrangement.EDGE_L
-                ]):
-                    # Only return candidate if it is valid for this face (long approach for debugging)
-                    if (targeted == 0 or targeted == 1) and [0, 1] == possibility_faces:
-                        if pieces[5].value == faces.F.center.value and pieces[12].value == faces.R.center.value:
-                            continue
-                        elif 4 in possibility_faces:
-                            filtered_preliminary.append(possibility)
-                        else:
-                            return [possibility]
-                    elif (targeted == 0 or targeted == 3) and [0, 3] == possibility_faces:
-                        if pieces[32].value == faces.L.center.value and pieces[3].value == faces.F.center.value:
-                            continue
-                        elif 4 in possibility_faces:
-                            filtered_preliminary.append(possibility)
-                        else:
-                            return [possibility]
-                    elif (targeted == 1 or targeted == 2) and [1, 2] == possibility_faces:
-                        if pieces[14].value == faces.R.center.value and pieces[21].value == faces.B.center.value:
-                            continue
-                        elif pieces[possibility.arrangement.true_indexes[0]].value == faces.B.center.value and pieces[possibility.arrangement.true_indexes[1]].value == faces.R.center.value and targeted == 1:
-                            raise FaceAlreadySolved()
-                        elif 4 in possibility_faces:
-                            filtered_preliminary.append(possibility)
-                        else:
-                            return [possibility]
-                    elif (targeted == 2 or targeted == 3) and [2, 3] == possibility_faces:
-                        if pieces[23].value == faces.B.center.value and pieces[30].value == faces.L.center.value:
-                            continue
-                        elif 4 in possibility_faces:
-                            filtered_preliminary.append(possibility)
-                        else:
-                            return [possibility]
+                if 4 in possibility.adjacent_faces or possibility.arrangement in BOTTOM_CROSS_EDGES:
+                    continue
+                adjacent_faces = frozenset(possibility.adjacent_faces)
+                if targeted not in adjacent_faces:
+                    continue
+
+                # Skip pieces that belong in no slot, such as edges with the bottom color, and those whose slot is already set
+                slot = MIDDLE_LAYER_SLOTS.get(adjacent_faces)
+                if slot is None or all(pieces[index].value == faces[face].center.value for index, face in slot):
+                    continue
+
+                # A right face edge sitting in its slot flipped is picked up from the back face instead
+                if targeted == 1 and adjacent_faces == {1, 2} and all(
+                    pieces[index].value == faces[face].center.value
+                    for index, face in zip(possibility.arrangement.true_indexes, (2, 1))
+                ):
+                    return CandidateStatus.FACE_SOLVED, []
+                return CandidateStatus.FOUND, [possibility]
             
             # If no possibilities remain, that does not mean there are none left, in this case, mark the face as solved for next pass
-            raise FaceAlreadySolved()
-
+            return CandidateStatus.FACE_SOLVED, []
+        elif self.name == 'LastLayer':
+            # The whole top layer is solved at once, from whichever face is targeted
+            if phase_solved is None:
+                phase_solved = self.get_pieces_solved(faces, pieces) == self.value.pieces_to_set
+            if phase_solved:
+                return CandidateStatus.PHASE_SOLVED, []
+            possibilities = [pieces[index] for index in LAST_LAYER_FACELETS]
 
         # If no possibilities remain, phase already solved
         if not possibilities:
-            raise PhaseAlreadySolved()
-        return possibilities
+            return CandidateStatus.PHASE_SOLVED, []
+        return CandidateStatus.FOUND, possibilities
 
 
 @dataclass
@@ -610,12 +507,6 @@ class CubePiece:
     arrangement: CubeArrangement
     adjacent_faces: Set[int]
 
-    def shift(self, new_value):
-        """ A small helper that allows shifting of pieces within dataclass while retaining the previous value. """
-        temp = self.value
-        self.value = new_value
-        return temp
-    
     def __repr__(self):
         # Faces does not provide the ORDER of the faces, in this case, we must use the current value to determine the order dynamically
         return f"index={self.index}, row_major={self.rm_index}, value={self.value}, current_face={self.current_face}, identity={self.arrangement.name}, faces={self.adjacent_faces}"
@@ -623,11 +514,10 @@ class CubePiece:
 
 class CubeFace(Enum):
     """
-    Maps a cube face to its array number, defines the inverse,
-    and provides helper methods to access its edges, corners, the center, and its color (identity)
+    Maps a cube face to its array number and defines the inverse.
 
-    Functionally, manipulating state is not a common use for enums, but the benefit is that we can easily access and manipulate a single face
-    without instantiation, turning this implementation into more of a singleton, which is perfect for this use case.
+    The enum is shared by every cube in the process and therefore holds no cube state, the centers, edges, and corners
+    for a single cube are tracked per instance by CubeFaceState.
     """
     F = 0
     R = 1
@@ -635,14 +525,6 @@ class CubeFace(Enum):
     L = 3
     U = 4
     D = 5
-    _SKIRT_MAP = [(7, 4, 1), (1, 2, 3), (3, 6, 9), (9, 8, 7)]
-
-    def __init__(self, _):
-        self._edges = []
-        self._corners = []
-        self._skirt = []
-        self._center = None
-        self._color = None
 
     @property
     def opposite(self):
@@ -655,104 +537,6 @@ class CubeFace(Enum):
             CubeFace.D: CubeFace.U
         }[self]
 
-    @property
-    def color(self):
-        return self._center.value
-
-    @color.setter
-    def color(self, value: str):
-        self._color = value
-
-    @property
-    def center(self) -> CubePiece:
-        return self._center
-
-    @center.setter
-    def center(self, value: CubePiece):
-        self._center = value
-        self.color = value.value
-
-    @property
-    def edges(self) -> List[CubePiece]:
-        return self._edges
-
-    @edges.setter
-    def edges(self, value: List[CubePiece]):
-        self._edges = value
-        if len(self._corners) > 0:
-            self._set_skirt()
-
-    @property
-    def corners(self) -> List[CubePiece]:
-        return self._corners
-
-    @corners.setter
-    def corners(self, value: List[CubePiece]):
-        self._corners = value
-        if len(self._edges) > 0:
-            self._set_skirt()
-
-    def _set_skirt(self):
-        """ The skirt is the first row or column of cubes surrounding the current face, it is important because it rotates along with the
-            face. Having a consistent definition for the positioning of this area allows us to create generic translations regardless of positioning
-
-            In row major order, the skirt starts from the bottom-left of a cube, and each cube index corresponds to the next mapped area
-
-            CUBE FACE:
-            1  2  3
-            4  5  6
-            7  8  9
-
-            We index the position on the face but use our adjacency map to locate the piece bordering these cubes.
-        """
-        # Define the skirt map
-        skirt_pieces = [*self._edges, *self._corners]
-        for group in self._SKIRT_MAP.value:
-            skirt_group = []
-            for x, edge in enumerate(group):
-                # Cubes have clockwise arrangements by design, accessing the second index is only done on the first of each face
-                index_pop = 2 if x == 0 else 1
-
-                # Locate a piece that maches the index
-                found_piece = list(filter(lambda v: v.rm_index == edge, skirt_pieces))[0]
-
-                # Values need to wrap around differently for corners and edges
-                cutoff = 3 if found_piece.arrangement.piece_type == "CORNER" else 2
-
-                # Obtain skirt value indexes
-                values = found_piece.arrangement.indexes
-                offset = values.index(found_piece.index + 1)
-                offset_index = (index_pop + offset) % cutoff
-                mapped_value = values[offset_index]
-
-                # Save skirt index within group
-                skirt_group.append(mapped_value)
-            self._skirt.append(skirt_group)
-
-    def rotate(self, pieces, command):
-        """ Allows rotation of a single face in a clockwise or anti-clockwise direction. """
-        # Determine direction by upper/lowercase ascii value
-        direction = "CW"
-        if ord(command) >= 97:
-            direction = "ACW"
-
-        # Rotate face
-        temp_corner = self.corners[0].value
-        temp_edge = self.edges[0].value
-        corner_cw = [0, 2, 3, 1] if direction == "CW" else [0, 1, 3, 2]
-        edge_cw = [0, 1, 3, 2] if direction == "CW" else [0, 2, 3, 1]
-        for x, (corner, edge) in enumerate(zip(corner_cw, edge_cw)):
-            self.corners[corner].value = temp_corner if x == 3 else self.corners[corner_cw[x + 1]].value
-            self.edges[edge].value = temp_edge if x == 3 else self.edges[edge_cw[x + 1]].value
-
-        # Rotate skirt
-        skirt = self._skirt if direction == "CW" else [self._skirt[0], *self._skirt[:0:-1]]
-        for i in range(0, 3):
-            temp = pieces[skirt[0][i] - 1].value
-            for j in range(1, 5):
-                cube_index = skirt[j % 4][i] - 1
-                temp = pieces[cube_index].shift(temp)
-
     @staticmethod
     def translate_rotation(rotation: str, destination_face: int):
         """ This mapping is made to allow the cube to be solved from the same initial point regardless of the perspective from which the cube
@@ -807,48 +591,635 @@ class CubeFace(Enum):
             }[rotation.upper()]
 
 
-class Cube:
-    """ Provides methods for identifying, querying, and manipulating a 3x3 Rubik's Cube and checking its validity. """
-    def __init__(self, input_cube: str):
-        # Check validity of input
-        if input_cube is None or input_cube == '':
-            raise CubeMissing()
+# Each face as a translation table for move strings written from the front, keeping the direction of every move
+ROTATION_TRANSLATIONS = tuple(
+    str.maketrans({
+        command: CubeFace.translate_rotation(command, face).lower() if command.islower() else CubeFace.translate_rotation(command, face)
+        for command in "FRBLUDfrblud"
+    })
+    for face in range(CUBE_FACES)
+)
+
+
+@dataclass
+class CubeFaceState:
+    """
+    Holds the pieces of a single face for one cube instance.
+
+    face: the face these pieces belong to
+    center: the center piece, which identifies the color of the face
+    edges: the edge pieces of the face in row-major order
+    corners: the corner pieces of the face in row-major order
+    """
+    face: CubeFace
+    center: CubePiece
+    edges: List[CubePiece]
+    corners: List[CubePiece]
+
+    @property
+    def color(self):
+        return self.center.value
+
+    @property
+    def skirt(self) -> Tuple[Tuple[int, ...], ...]:
+        return FACE_SKIRTS[self.face.value]
+
+
+class CubeFaces(tuple):
+    """ The six face states of a cube, accessible by index or by face name the same way CubeFace members are. """
+
+    @property
+    def F(self) -> CubeFaceState:
+        return self[CubeFace.F.value]
+
+    @property
+    def R(self) -> CubeFaceState:
+        return self[CubeFace.R.value]
+
+    @property
+    def B(self) -> CubeFaceState:
+        return self[CubeFace.B.value]
+
+    @property
+    def L(self) -> CubeFaceState:
+        return self[CubeFace.L.value]
+
+    @property
+    def U(self) -> CubeFaceState:
+        return self[CubeFace.U.value]
+
+    @property
+    def D(self) -> CubeFaceState:
+        return self[CubeFace.D.value]
+
+
+# Row-major groups bordering a face, starting from the bottom-left and moving clockwise
+FACE_SKIRT_MAP = ((7, 4, 1), (1, 2, 3), (3, 6, 9), (9, 8, 7))
+
+# Row-major face cycles for a clockwise quarter turn, written as (destination, source) pairs of 1-based face positions
+FACE_CYCLE_CW = ((1, 7), (7, 9), (9, 3), (3, 1), (2, 4), (4, 8), (8, 6), (6, 2))
+
+# Move codes are laid out as face * 3 + (quarter turns - 1), so each face owns a clockwise, half, and anti-clockwise slot
+MOVE_NAMES = tuple(name for face in CubeFace for name in (face.name, face.name * 2, face.name.lower()))
+MOVE_CODES = {name: code for code, name in enumerate(MOVE_NAMES) if len(name) == 1}
+
+
+def _face_skirt(face: int) -> Tuple[Tuple[int, ...], ...]:
+    """ The skirt is the first row or column of cubes surrounding the current face, it is important because it rotates along with the
+        face. Having a consistent definition for the positioning of this area allows us to create generic translations regardless of positioning
+
+        In row major order, the skirt starts from the bottom-left of a cube, and each cube index corresponds to the next mapped area
+
+        CUBE FACE:
+        1  2  3
+        4  5  6
+        7  8  9
+
+        We index the position on the face but use our adjacency map to locate the 0-based index of the piece bordering these cubes.
+        Shifting every group forward by one is a clockwise turn.
+    """
+    skirt = []
+    for group in FACE_SKIRT_MAP:
+        skirt_group = []
+        for x, rm_index in enumerate(group):
+            # Cubes have clockwise arrangements by design, accessing the second index is only done on the first of each group
+            index_pop = 2 if x == 0 else 1
+            index = face * CUBE_FACE_PIECES + rm_index - 1
+            arrangement = ELEMENT_ARRANGEMENTS[index]
+
+            # Values need to wrap around differently for corners and edges
+            cutoff = 3 if arrangement.piece_type == PieceType.CORNER.value else 2
+            offset = arrangement.true_indexes.index(index)
+            skirt_group.append(arrangement.true_indexes[(index_pop + offset) % cutoff])
+        skirt.append(tuple(skirt_group))
+    return tuple(skirt)
+
+
+# Face topology is identical for every cube, so it is computed once at import and only referenced by instances
+FACE_CENTERS = tuple(FACE_TYPE_ELEMENTS[face, PieceType.CENTER.value][0] for face in range(CUBE_FACES))
+FACE_EDGES = tuple(FACE_TYPE_ELEMENTS[face, PieceType.EDGE.value] for face in range(CUBE_FACES))
+FACE_CORNERS = tuple(FACE_TYPE_ELEMENTS[face, PieceType.CORNER.value] for face in range(CUBE_FACES))
+FACE_SKIRTS = tuple(_face_skirt(face) for face in range(CUBE_FACES))
+
+
+def _compose(first: Tuple[int, ...], second: Tuple[int, ...]) -> Tuple[int, ...]:
+    """ Combines two gather permutations into one that has the effect of applying first, then second. """
+    return tuple(first[index] for index in second)
+
+
+def _build_move_tables() -> Tuple[Tuple[int, ...], ...]:
+    """ Builds the 18 gather permutations for every face turn, where new_cube[i] = old_cube[table[i]]. """
+    tables = []
+    for face in range(CUBE_FACES):
+        quarter = list(range(CUBE_PIECES))
+        offset = face * CUBE_FACE_PIECES
 
-        # Test to see if value is a string
-        if not isinstance(input_cube, str):
-            raise InvalidCubeType(input_cube)
+        # Rotate the face itself
+        for destination, source in FACE_CYCLE_CW:
+            quarter[offset + destination - 1] = offset + source - 1
 
-        # Variations on conversion to raw string implies invalid characters
-        if len(repr(input_cube)) - 2 != len(input_cube):
-            raise InvalidCubeCharacters(input_cube)
+        # Rotate the skirt, each group takes on the values of the group before it
+        skirt = FACE_SKIRTS[face]
+        for x, group in enumerate(skirt):
+            for destination, source in zip(group, skirt[x - 1]):
+                quarter[destination] = source
 
-        # Test for the actual value length
-        if len(input_cube) != CUBE_PIECES:
-            raise InvalidCubeLength(input_cube)
+        quarter = tuple(quarter)
+        half = _compose(quarter, quarter)
+        tables.extend([quarter, half, _compose(half, quarter)])
+    return tuple(tables)
 
-        # Check for illegal characters. Match 54 characters containing a-z, A-Z, and 0-9 only using Regex. No match returns None.
-        if not re.match(r'[a-zA-Z0-9]{54}', input_cube):
-            raise InvalidCubeCharacters(input_cube)
+
+MOVE_TABLES = _build_move_tables()
+MOVE_GATHERS = tuple(itemgetter(*table) for table in MOVE_TABLES)
+
+def apply_move(facelets: str, code: int) -> str:
+    """ Applies a single move code to a flat facelet string with one indexed gather. """
+    return "".join(MOVE_GATHERS[code](facelets))
+
+
+class TurnMetric(Enum):
+    """ Defines how half turns are written out when a move sequence is formatted. """
+    QUARTER = "QUARTER"     # half turns are written as two quarter turns, e.g. FF
+    HALF = "HALF"           # half turns are written with a suffix, e.g. F2
+
+
+OPPOSITE_FACES = tuple(face.opposite.value for face in CubeFace)
+
+
+def parse_moves(moves: str) -> List[int]:
+    """ Converts a move string into move codes. Lowercase letters and a ' suffix are anti-clockwise, a 2 suffix is a half turn. """
+    codes = []
+    for command in moves:
+        if command == "2" and codes:
+            codes[-1] = codes[-1] - codes[-1] % 3 + 1
+        elif command == "'" and codes:
+            codes[-1] = codes[-1] - codes[-1] % 3 + 2 - codes[-1] % 3
+        else:
+            codes.append(MOVE_CODES[command])
+    return codes
+
+
+def format_moves(codes, metric: TurnMetric = TurnMetric.QUARTER) -> str:
+    """ Converts move codes back into a move string, writing half turns according to the turn metric. """
+    if metric == TurnMetric.HALF:
+        return "".join(MOVE_NAMES[code][0] + "2" if code % 3 == 1 else MOVE_NAMES[code] for code in codes)
+    return "".join(MOVE_NAMES[code] for code in codes)
+
+
+def simplify_moves(moves: str, metric: TurnMetric = TurnMetric.QUARTER) -> str:
+    """ Reduces a move sequence to its shortest equivalent form by merging and cancelling turns of the same face.
+        Opposite faces (U/D, F/B, L/R) commute, so a turn is also merged across a turn of the opposite face, e.g. FBf --> B.
+        Commuting pairs are written in face order, which makes the output a normal form: equivalent inputs built from the same
+        turns give the same string.
+    """
+    # Each entry holds a face and its clockwise quarter turn count, the tail of the list is at most one commuting pair
+    reduced = []
+    for code in parse_moves(moves):
+        face, turns = divmod(code, 3)
+        turns += 1
+
+        # Look for the same face at the end of the list, possibly behind a turn of the opposite face
+        position = None
+        for x in range(len(reduced) - 1, max(len(reduced) - 3, -1), -1):
+            if reduced[x][0] == face:
+                position = x
+                break
+            elif reduced[x][0] != OPPOSITE_FACES[face]:
+                break
+
+        if position is not None:
+            reduced[position][1] = (reduced[position][1] + turns) % 4
+            if reduced[position][1] == 0:
+                del reduced[position]
+        elif reduced and reduced[-1][0] == OPPOSITE_FACES[face] and face < reduced[-1][0]:
+            reduced.insert(len(reduced) - 1, [face, turns])
+        else:
+            reduced.append([face, turns])
+    return format_moves((face * 3 + turns - 1 for face, turns in reduced), metric)
+
+
+@dataclass(frozen=True)
+class CompiledMoves:
+    """
+    A move sequence composed into a single permutation so that it can be applied to a cube in one step.
+
+    moves: the normalized move string this permutation was built from
+    codes: the move codes of the normalized string
+    table: the composed gather permutation, where new_cube[i] = old_cube[table[i]]
+    gather: an itemgetter over the table
+    affected: the (destination, source) pairs for every facelet the sequence changes
+    """
+    moves: str
+    codes: Tuple[int, ...]
+    table: Tuple[int, ...]
+    gather: itemgetter
+    affected: Tuple[Tuple[int, int], ...]
+
+    def apply(self, facelets: str) -> str:
+        return "".join(self.gather(facelets))
+
+
+def invert_moves(moves: str) -> str:
+    """ The sequence that undoes a move string: the moves in reverse order with their directions swapped. """
+    return format_moves(code - code % 3 + 2 - code % 3 for code in reversed(parse_moves(moves)))
+
+
+# Only normalized sequences up to this long are cached, so that long rotate commands sent by clients are not kept alive
+COMPILE_CACHE_LENGTH = 64
+
+
+def _compile_normalized(moves: str) -> CompiledMoves:
+    codes = tuple(parse_moves(moves))
+    table = tuple(range(CUBE_PIECES))
+    for code in codes:
+        table = _compose(table, MOVE_TABLES[code])
+    return CompiledMoves(
+        moves,
+        codes,
+        table,
+        itemgetter(*table),
+        tuple((index, source) for index, source in enumerate(table) if index != source)
+    )
+
+
+_compile_cached = lru_cache(maxsize=1024)(_compile_normalized)
+
+
+def compile_moves(moves: str) -> CompiledMoves:
+    """ Compile a move string into a single composed permutation. Short sequences are cached by their normalized form,
+        so repeated rotate commands and the fixed heuristic algorithms are only composed once.
+    """
+    normalized = simplify_moves(moves)
+    if len(normalized) > COMPILE_CACHE_LENGTH:
+        return _compile_normalized(normalized)
+    return _compile_cached(normalized)
+
+
+# The top layer facelets apart from the center, and the same facelets grouped into corners and edges
+LAST_LAYER_FACELETS = tuple(
+    index for index, arrangement in enumerate(ELEMENT_ARRANGEMENTS)
+    if CubeFace.U.value in arrangement.adjacencies and arrangement.piece_type != PieceType.CENTER.value
+)
+LAST_LAYER_PIECES = tuple(
+    tuple(arrangement.true_indexes) for arrangement in dict.fromkeys(ELEMENT_ARRANGEMENTS[index] for index in LAST_LAYER_FACELETS)
+)
+
+# The bottom cross edges, and the middle layer slots keyed by the faces they border as (facelet, face) pairs
+BOTTOM_CROSS_EDGES = frozenset(CubeHeuristics.BottomCross.value.success_metric)
+MIDDLE_LAYER_SLOTS = {
+    frozenset(arrangement.adjacencies): tuple((index, index // CUBE_FACE_PIECES) for index in arrangement.true_indexes)
+    for arrangement in CubeHeuristics.MiddleLayer.value.success_metric
+}
+
+# The facelets of every piece each phase sets, by phase order. Cubes count how many of them are in place as they turn. The side
+# facelets of the bottom layer are included so that a bottom layer turned out of place is not taken for a solved one.
+PHASE_FACELETS = (
+    tuple(index for index in FACE_EDGES[CubeFace.D.value] for index in ELEMENT_ARRANGEMENTS[index].true_indexes),
+    tuple(index for index in FACE_CORNERS[CubeFace.D.value] for index in ELEMENT_ARRANGEMENTS[index].true_indexes),
+    tuple(index for slot in MIDDLE_LAYER_SLOTS.values() for index, face in slot),
+    LAST_LAYER_FACELETS
+)
+FACELET_PHASES = tuple(
+    next((order for order, facelets in enumerate(PHASE_FACELETS) if index in facelets), None) for index in range(CUBE_PIECES)
+)
+
+# Every side face a phase can target, the algorithms are always translated to it from the front
+SIDE_FACES = (CubeFace.F.value, CubeFace.R.value, CubeFace.B.value, CubeFace.L.value)
+
+
+def _compile_bottom_cross() -> dict:
+    """ The cross algorithms and success condition for an edge at each facelet, keyed by (facelet, target face).
+        The algorithm is chosen by the first heuristic group whose arrangements include the edge, and its variant by where the edge faces.
+    """
+    properties = CubeHeuristics.BottomCross.value
+    algorithms = {}
+    for target in SIDE_FACES:
+        for index in TYPE_ELEMENTS[PieceType.EDGE.value]:
+            name = ELEMENT_ARRANGEMENTS[index].name
+            for face, points in properties.arrangement_heuristic.items():
+                if any(f'EDGE_{point}' in name for point in points[target]):
+                    alt = properties.translation_parameters[face](index // CUBE_FACE_PIECES, target)
+                    algorithms[index, target] = (
+                        tuple(CubeHeuristics.translate_heuristics(properties.heuristics[face][alt], target, [''])),
+                        properties.success_metric[target]
+                    )
+                    break
+    return algorithms
+
+
+def _compile_lower_layer() -> dict:
+    """ The corner insertion for a corner at each facelet as (unrotated, algorithm), keyed by (facelet, target face).
+        Corners already on the bottom are lifted out first, corners on top are turned above their slot and inserted.
+    """
+    properties = CubeHeuristics.LowerLayer.value
+    heuristics = properties.heuristics
+    algorithms = {}
+    for target in SIDE_FACES:
+        for index in TYPE_ELEMENTS[PieceType.CORNER.value]:
+            arrangement = ELEMENT_ARRANGEMENTS[index]
+            current_face, rm_index = divmod(index, CUBE_FACE_PIECES)
+            rm_index += 1
+
+            if arrangement in properties.success_metric:
+                # Candidate piece is at the bottom of the cube
+                candidate_order = properties.success_metric.index(arrangement)
+                lift_heur = heuristics['LIFT'][candidate_order][0]
+                rot_heur = "U" * ((3 + candidate_order - target) % 4)
+                if current_face == 5:
+                    face = "F"
+                elif rm_index == 7:
+                    face = "R"
+                elif rm_index == 9:
+                    face = "U"
+                else:
+                    continue
+                adj_heur = CubeHeuristics.translate_heuristics(heuristics[face], target, [''])
+                algorithms[index, target] = (
+                    CubeHeuristics.minimize(f"{lift_heur}{rot_heur}{heuristics[face][0]}"),
+                    CubeHeuristics.minimize(f"{lift_heur}{rot_heur}{adj_heur[0]}")
+                )
+            else:
+                # Find out how many spaces we need to rotate the top to line up with the bottom piece
+                heur = heuristics['F'][0]
+                candidate_order = current_face
+                if current_face == 4:
+                    heur = heuristics['U'][0]
+                    candidate_order = {1: 2, 3: 1, 9: 0}.get(rm_index, 3)
+                elif rm_index == 1:
+                    # Red piece on right-hand side
+                    heur = heuristics['R'][0]
+                    candidate_order = (3 + current_face) % 4
+                rot_heur = "U" * ((4 + candidate_order - target) % 4)
+                unrotated = CubeHeuristics.minimize(f"{rot_heur}{heur}")
+                algorithms[index, target] = unrotated, CubeHeuristics.translate_heuristics([unrotated], target, [''])[0]
+    return algorithms
+
+
+def _compile_middle_layer() -> dict:
+    """ The middle layer algorithm and success condition for an edge, keyed by (facelet, edge faces, target face).
+        Edges are turned above the target face and inserted towards the side they share with it. Edges that are lifted out of a wrong
+        slot or still carry the top color have no success condition, the next pass inserts them.
+    """
+    properties = CubeHeuristics.MiddleLayer.value
+    edge_faces = [frozenset(adjacencies) for adjacencies in ADJACENCY_ARRANGEMENTS if len(adjacencies) == 2]
+    algorithms = {}
+    for target in SIDE_FACES:
+        left_side = (target + 3) % 4
+        right_side = (target + 1) % 4
+        for index in TYPE_ELEMENTS[PieceType.EDGE.value]:
+            lifted = ELEMENT_ARRANGEMENTS[index] in properties.success_metric
+            current_face = index // CUBE_FACE_PIECES
+            rot = "u" * ((target - current_face + 4) % 4) if current_face != target else ""
+            for adjacent_faces in edge_faces:
+                if left_side in adjacent_faces:
+                    heur, success_condition = properties.heuristics['L'], properties.success_metric[left_side]
+                elif right_side in adjacent_faces:
+                    heur, success_condition = properties.heuristics['R'], properties.success_metric[target]
+                else:
+                    continue
+                if lifted:
+                    # An edge in the wrong slot is lifted out of the slot it sits in, whichever face it is headed for
+                    heur, rot = properties.heuristics['R'], ''
+                    algorithm = CubeHeuristics.translate_heuristics(heur, properties.success_metric.index(ELEMENT_ARRANGEMENTS[index]), [rot])
+                else:
+                    algorithm = CubeHeuristics.translate_heuristics(heur, target, [rot])
+                algorithm = CubeHeuristics.minimize(algorithm[0])
+                algorithms[index, adjacent_faces, target] = (
+                    (algorithm,), None if lifted or CubeFace.U.value in adjacent_faces else success_condition
+                )
+    return algorithms
+
+
+# Heuristic phases only ever look up algorithms by where a piece sits and which face it is headed for, so they are all compiled once
+BOTTOM_CROSS_ALGORITHMS = _compile_bottom_cross()
+LOWER_LAYER_ALGORITHMS = _compile_lower_layer()
+MIDDLE_LAYER_ALGORITHMS = _compile_middle_layer()
+
+# Where each top layer facelet takes its face from after a U turn, as positions in LAST_LAYER_FACELETS
+LAST_LAYER_POSITIONS = {index: position for position, index in enumerate(LAST_LAYER_FACELETS)}
+LAST_LAYER_TURN = tuple(LAST_LAYER_POSITIONS[MOVE_TABLES[MOVE_CODES['U']][index]] for index in LAST_LAYER_FACELETS)
+
+
+def _orientation_index(pattern: Tuple[int, ...]) -> bytes:
+    """ The top layer orientation: which facelets show the top color. """
+    return bytes(face == CubeFace.U.value for face in pattern)
+
+
+def _permutation_index(pattern: Tuple[int, ...]) -> bytes:
+    """ The top layer permutation, once it is oriented: the face of every facelet. """
+    return bytes(pattern)
+
+
+def _last_layer_index(pattern: Tuple[int, ...], index) -> Tuple[bytes, int]:
+    """ Normalize a pattern for the U turns that can be made before an algorithm, returning the smallest index among the four
+        turns together with the number of U turns that produce it.
+    """
+    best = None
+    for turns in range(4):
+        key = index(pattern)
+        if best is None or key < best[0]:
+            best = key, turns
+        pattern = tuple(pattern[source] for source in LAST_LAYER_TURN)
+    return best
+
+
+def _compile_last_layer(macros: List[str], index) -> dict:
+    """ Search outwards from the solved top layer through the macros and U turns, so that every pattern the macros can reach is
+        solved by undoing the fewest macros. Only patterns that are already normalized for U turns are kept.
+    """
+    solved = tuple(index // CUBE_FACE_PIECES for index in LAST_LAYER_FACELETS)
+    algorithms = {index(solved): ''}
+    frontier = [(solved, '')]
+    moves = [compile_moves(macro) for macro in macros + ['U', 'UU', 'u']]
+    while frontier:
+        next_frontier = []
+        for pattern, solution in frontier:
+            for compiled in moves:
+                child = tuple(pattern[LAST_LAYER_POSITIONS[compiled.table[facelet]]] for facelet in LAST_LAYER_FACELETS)
+                key = index(child)
+                if key not in algorithms:
+                    algorithms[key] = simplify_moves(invert_moves(compiled.moves) + solution)
+                    next_frontier.append((child, algorithms[key]))
+        frontier = next_frontier
+    return {key: algorithm for key, algorithm in algorithms.items() if key == _last_layer_index(key, lambda pattern: bytes(pattern))[0]}
+
+
+# The orientation and permutation algorithms for each normalized top layer pattern
+ORIENTATION_ALGORITHMS = _compile_last_layer(CubeHeuristics.LastLayer.value.heuristics['OLL'], _orientation_index)
+PERMUTATION_ALGORITHMS = _compile_last_layer(CubeHeuristics.LastLayer.value.heuristics['PLL'], _permutation_index)
+
+
+def last_layer_algorithm(pattern: Tuple[int, ...]) -> str:
+    """ The algorithm that solves the top layer of a cube whose first two layers are solved, from the faces of its top layer
+        facelets in LAST_LAYER_FACELETS order. The orientation is looked up first, its effect on the pattern is applied, and then
+        the permutation is looked up. Returns None if the pattern cannot be reached, which means the cube has been tampered with.
+    """
+    key, turns = _last_layer_index(pattern, _orientation_index)
+    orientation = ORIENTATION_ALGORITHMS.get(key)
+    if orientation is None:
+        return None
+    orientation = "U" * turns + orientation
+    compiled = compile_moves(orientation)
+    pattern = tuple(pattern[LAST_LAYER_POSITIONS[compiled.table[facelet]]] for facelet in LAST_LAYER_FACELETS)
+
+    key, turns = _last_layer_index(pattern, _permutation_index)
+    permutation = PERMUTATION_ALGORITHMS.get(key)
+    if permutation is None:
+        return None
+    return simplify_moves(orientation + "U" * turns + permutation)
+
+
+class CubeHistory:
+    """
+    Records every state a cube passes through as a log of move codes instead of full cube strings.
+    A checkpoint string is kept at least every CHECKPOINT_INTERVAL moves so that any state can be rebuilt on demand from the nearest one.
+
+    enabled: whether moves are recorded at all, production solves that only need the final cube can turn this off
+    """
+    CHECKPOINT_INTERVAL = 64
+
+    def __init__(self, initial_state: str, enabled: bool = True):
+        self.enabled = enabled
+        self._moves = bytearray()
+        self._checkpoint_positions = [0]
+        self._checkpoint_states = [initial_state]
+
+    def record(self, code: int, state: str):
+        """ Append a move along with the state it produced, which is only kept when a checkpoint is due. """
+        self.extend((code,), state)
+
+    def extend(self, codes, state: str):
+        """ Append a sequence of moves along with the state produced by the whole sequence. """
+        if not self.enabled:
+            return
+        self._moves.extend(codes)
+        if len(self._moves) - self._checkpoint_positions[-1] >= self.CHECKPOINT_INTERVAL:
+            self._checkpoint_positions.append(len(self._moves))
+            self._checkpoint_states.append(state)
+
+    @property
+    def moves(self) -> str:
+        return format_moves(self._moves)
+
+    def moves_between(self, start: int, stop: int) -> str:
+        """ The moves that carry the state after start moves to the state after stop moves. """
+        return format_moves(self._moves[start:stop])
+
+    def state(self, index: int) -> str:
+        """ Rebuild the state after the given number of moves, where 0 is the initial cube. """
+        if not 0 <= index <= len(self._moves):
+            raise IndexError(index)
+        checkpoint = bisect_right(self._checkpoint_positions, index) - 1
+        state = self._checkpoint_states[checkpoint]
+        for code in self._moves[self._checkpoint_positions[checkpoint]:index]:
+            state = apply_move(state, code)
+        return state
+
+    def states(self, start: int = 0, stop: int = None):
+        """ Yield the recorded states in order from the state after start moves, by default every state from the initial cube. """
+        state = self.state(start)
+        yield state
+        for code in self._moves[start:stop]:
+            state = apply_move(state, code)
+            yield state
+
+    def __len__(self):
+        return len(self._moves)
+
+
+# Every edge and corner as its facelets, in the order the pieces are first reached when reading a cube string
+PIECE_FACELETS = tuple(
+    (tuple(arrangement.true_indexes), arrangement.piece_type == PieceType.CORNER.value)
+    for arrangement in sorted(
+        (arrangement for arrangement in ADJACENCY_ARRANGEMENTS.values() if arrangement.piece_type != PieceType.CENTER.value),
+        key=lambda arrangement: min(arrangement.true_indexes)
+    )
+)
+
+# Facelet colors are validated as one bit per face, so the colors of a piece combine into a mask of the faces it touches.
+# The pieces are read as three gathers of one facelet each, edges repeat a facelet in the third, so that a whole cube is masked at once.
+FACE_BITS = bytes(1 << face for face in range(CUBE_FACES))
+FACE_COUNTS = (CUBE_FACE_PIECES,) * CUBE_FACES
+FACE_INDEXES = bytes.maketrans(FACE_BITS, bytes(range(CUBE_FACES)))
+PIECE_GATHERS = tuple(itemgetter(*(facelets[min(x, len(facelets) - 1)] for facelets, corner in PIECE_FACELETS)) for x in range(3))
+INVALID_FACE_MASKS = bytes(
+    mask not in {sum(1 << face for face in adjacencies) for adjacencies in ADJACENCY_ARRANGEMENTS} for mask in range(256)
+)
+
+
+@lru_cache(maxsize=1024)
+def _face_bits(centers: bytes) -> bytes:
+    return bytes.maketrans(centers, FACE_BITS)
+
+
+def validate_cube(cube) -> bytes:
+    """ Check a cube string in one pass without building a Cube, raising the same error a Cube would for the first problem found:
+        a missing cube, a value that is not a string, invalid characters, the wrong length, centers that are not six distinct colors
+        or colors matching no center, an edge or corner whose colors do not form a piece (whichever is first in the string), and
+        finally a color that does not occur 9 times. Returns the face index of every facelet (see Cube.face_map).
+    """
+    if cube is None or cube == '':
+        raise CubeMissing()
+    if not isinstance(cube, str):
+        raise InvalidCubeType(cube)
+
+    # Only 54 ASCII letters and digits are valid, the slower checks just decide which error to report
+    if len(cube) != CUBE_PIECES or not (cube.isascii() and cube.isalnum()):
+        if len(repr(cube)) - 2 != len(cube) or len(cube) == CUBE_PIECES:
+            raise InvalidCubeCharacters(cube)
+        raise InvalidCubeLength(cube)
+
+    encoded = cube.encode('ascii')
+    centers = encoded[FACE_CENTERS[0]::CUBE_FACE_PIECES]
+    if len(set(centers)) != CUBE_FACES:
+        raise InvalidCubeCenter(cube)
+
+    # Colors matching a center become that face's bit, any color left over once the bits are removed matches no center
+    bits = encoded.translate(_face_bits(centers))
+    if bits.translate(None, FACE_BITS):
+        raise InvalidCubeCenter(cube)
+
+    first, second, third = (int.from_bytes(bytes(gather(bits)), 'little') for gather in PIECE_GATHERS)
+    invalid = (first | second | third).to_bytes(len(PIECE_FACELETS), 'little').translate(INVALID_FACE_MASKS).find(1)
+    if invalid >= 0:
+        raise InvalidCubeCorner(cube) if PIECE_FACELETS[invalid][1] else InvalidCubeEdge(cube)
+
+    if tuple(map(bits.count, FACE_BITS)) != FACE_COUNTS:
+        color = next(color for color in dict.fromkeys(cube) if cube.count(color) != CUBE_FACE_PIECES)
+        raise InvalidCubeComposition(color, cube)
+    return bits.translate(FACE_INDEXES)
+
+class Cube:
+    """ Provides methods for identifying, querying, and manipulating a 3x3 Rubik's Cube and checking its validity. """
+    def __init__(self, input_cube: str, history: bool = True):
+        # Check validity of input
+        validate_cube(input_cube)
 
         # Cube parameters
         self._cube_string = input_cube
         self._cube_map: str                 # a 1-to-1 face map of the input string
-        self._faces = CubeFace              # identifies all the faces of this cube by index or name
+        self._faces: CubeFaces = None       # identifies all the faces of this cube by index or name
         self._pieces: List[CubePiece] = []  # the individual pieces that make up the cube and their properties
         self._pinned_centerpieces = {}      # to simplify solve, we assume that the central locations of the cube are the permanent faces and can be pinned
         self._remap_pieces()                # convert input string to a same-size string containing the face index for each value
-        self._state = [self._cube_string]   # the cube state as a stack of values
+        self._phase_facelets = [            # the number of facelets each heuristic phase sets that are in place, kept up to date by turns
+            sum(self._cube_map[index] == index // CUBE_FACE_PIECES for index in facelets) for facelets in PHASE_FACELETS
+        ]
+        self._history = CubeHistory(        # the cube states as a log of moves, rebuilt on demand
+            self._cube_string,
+            enabled=history
+        )
 
         # Create cube object from data received
         self._unpack()
 
     def _unpack(self):
         """ This process reads in a cube string and unpacks each value to create cube pieces to add to a cube. """
-        # Create a cube object from input to continue validating
-        color_map = {}
+        # Create a cube object from input, which has already been validated
         for x, (piece_value, mapped_value) in enumerate(zip(self._cube_string, self._cube_map)):
             # Obtain current cube arrangement of the piece provided
-            arrangement = CubeArrangement.get_arrangement_from_element(x)
+            arrangement = ELEMENT_ARRANGEMENTS[x]
             row_major_index = (x + 1) % CUBE_FACE_PIECES
 
             # Create a cube piece with the relevant parameters
@@ -863,14 +1234,6 @@ class Cube:
             )
             self._add_piece(piece)
 
-            # Add the piece value and index to the color map
-            color_map[piece_value] = color_map.get(piece_value, 0) + 1
-
-        # Test for invalid cube conditions post unpack
-        for piece, count in color_map.items():
-            if count != 9:
-                raise InvalidCubeComposition(piece, self)
-
     def _remap_pieces(self):
         """ Updates internal state to recalculate cube mappings and locations. """
         # Retrieve pinned centerpieces by location
@@ -893,7 +1256,7 @@ class Cube:
             and ensures that the piece types get updated as new pieces are added.
         """
         # Check boundary conditions before adding piece
-        if CubeArrangement.is_valid_adjacency(piece.adjacent_faces) is None:
+        if ADJACENCY_ARRANGEMENTS.get(frozenset(piece.adjacent_faces)) is None:
             if piece.arrangement.piece_type == PieceType.CORNER.value:
                 raise InvalidCubeCorner(self)
             elif piece.arrangement.piece_type == PieceType.EDGE.value:
@@ -911,38 +1274,48 @@ class Cube:
 
     def _update(self):
         """ Calculate faces, corners, and edges for a cube. """
-        for i in range(0, CUBE_FACES):
-            # Obtain centerpiece, edges, and corners
-            self._faces(i).center = CubeArrangement.get_face_pieces(self._pieces, i, PieceType.CENTER)[0]
-            self._faces(i).edges = CubeArrangement.get_face_pieces(self._pieces, i, PieceType.EDGE)
-            self._faces(i).corners = CubeArrangement.get_face_pieces(self._pieces, i, PieceType.CORNER)
-
-    def rotate(self, rotate_command: List[str] = None):
-        """ Performs cube rotations from a command list, reconstructing/rebuilding after each execution phase and appending to global state. """
-        # Iterate through rotation commands, updating state each time
-        for command in rotate_command:
-            # Perform in-place rotation within face
-            self._faces[command.upper()].rotate(self._pieces, command)
-
-            # Save states to be able to show stages along with final results
-            self._reconstruct()
-            self._state.append(self._cube_string)
+        # Obtain centerpiece, edges, and corners for each face of this instance
+        self._faces = CubeFaces(
+            CubeFaceState(
+                CubeFace(i),
+                center=self._pieces[FACE_CENTERS[i]],
+                edges=[self._pieces[index] for index in FACE_EDGES[i]],
+                corners=[self._pieces[index] for index in FACE_CORNERS[i]],
+            )
+            for i in range(0, CUBE_FACES)
+        )
+
+    def rotate(self, rotate_command: str = None):
+        """ Performs cube rotations from a command string. The whole command is compiled into one permutation and applied to the
+            facelet buffer in a single step, updating the touched pieces and appending the moves to the state history.
+        """
+        compiled = compile_moves(rotate_command)
+        self._apply_compiled(compiled)
+
+        # Save states to be able to show stages along with final results
+        self._history.extend(compiled.codes, self._cube_string)
 
     def solve(self, cube_phase=10):
         """ This method executes a cube solve up to a certain operation phase.
             It locates the candidates, queries the algorithm class, performs the prescribed rotations, and checks if output was successful.
         """
-        # First step is to check if the cube is already solved, if so, return an empty string
+        return simplify_moves("".join(rotations for heuristic, rotations in self.solve_phases()))
+
+    def solve_phases(self):
+        """ Runs the solve one heuristic phase at a time, yielding each phase with the rotations it applied as soon as it is done,
+            so that callers can report progress while the later phases are still running. Nothing is yielded for a solved cube.
+        """
+        # First step is to check if the cube is already solved, if so, there is nothing to do
         last = self._cube_map[0]
         for new_last in self._cube_map[1:54]:
             if last > new_last:
                 break
             last = new_last
         else:
-            return ""
+            return
         
         # Target a specific solve step or a series of steps
-        heuristic_phases = [CubeHeuristics.BottomCross, CubeHeuristics.LowerLayer, CubeHeuristics.MiddleLayer]
+        heuristic_phases = [CubeHeuristics.BottomCross, CubeHeuristics.LowerLayer, CubeHeuristics.MiddleLayer, CubeHeuristics.LastLayer]
 
         # Check if we qualify for a bottom cross
         centerpiece = self._faces.D.center
@@ -958,21 +1331,22 @@ class Cube:
         for heuristic in heuristic_phases:
             
             # Leave headroom for unsolved pieces when operations require multiple laps
-            remaining_iterations = 1
+            remaining_iterations = 2
             
             # Middle layer gets a lot more iterations due to it needing to reevaluate the cube again after any move
             if heuristic == CubeHeuristics.MiddleLayer:
                 remaining_iterations = 16
             
             # Candidates are read on every loop, some heuristics require multiple passes
+            phase_rotations = ''
             unsolved_pieces = True
             while unsolved_pieces:
                 
                 # Apply rotations and append to rotation list if any were found
-                final_rotations += self._attempt_algorithms(heuristic, centerpiece)
+                phase_rotations += self._attempt_algorithms(heuristic, centerpiece)
 
                 # Check if all pieces have been solved for current phase
-                if heuristic.get_pieces_solved(self._faces, self._pieces) == 4:
+                if self.phase_solved(heuristic):
                     unsolved_pieces = False
                 elif remaining_iterations <= 0:
                     # If we have exceeded the number of iteration steps, the cube may be invalid (tampered) or we have an edge case to consider
@@ -980,11 +1354,10 @@ class Cube:
                 remaining_iterations -= 1
 
             # Visually verify solutions
+            final_rotations += phase_rotations
             print(f'\nNew cube: \t\t{self._cube_string}')
-
-            # Return final rotation
             print(f'Rotations: \t\t{final_rotations}\n')
-        return final_rotations
+            yield heuristic, phase_rotations
     
     
     def _attempt_algorithms(self, heuristic, centerpiece):
@@ -994,56 +1367,88 @@ class Cube:
         for current_face in [0, 1, 2, 3]:
             
             # Identify candidates, but skip phases if they are marked as complete, or move to the next face when designated
-            try:
-                # Identify candidates for current heuristic phase
-                candidates = heuristic.get_candidates(self._faces, self._pieces, targeted=current_face - adj)
-                
-                # Identify algorith or heuristic leading to a solution
-                algorithm, success_condition = heuristic.get_algorithm_by_arrangement(candidates, current_face - adj, centerpiece.adjacent_faces)
-            except FaceAlreadySolved:
-                continue
-            except PhaseAlreadySolved:
+            status, candidates = heuristic.get_candidates(
+                self._faces, self._pieces, targeted=current_face - adj, phase_solved=self.phase_solved(heuristic)
+            )
+            if status == CandidateStatus.PHASE_SOLVED:
                 break
+            if status == CandidateStatus.FACE_SOLVED:
+                continue
+
+            # Identify algorith or heuristic leading to a solution
+            match = heuristic.get_algorithm_by_arrangement(candidates, current_face - adj, centerpiece.adjacent_faces)
+            if match is None:
+                continue
+            algorithm, success_condition = match
 
-            # Test potential solutions from returned algorithms
+            # Test potential solutions from returned algorithms without touching the cube, and only apply the one that succeeds
             for heuristic_algorithm in algorithm:
-                
-                # Perform and apply individual rotations and update state list, then rebuild cube mappings
-                for command in heuristic_algorithm:
-                    self._faces[command.upper()].rotate(self._pieces, command)
-                    tentative = ("".join([f.value for f in self._pieces]))
-                    self._state.append(tentative)
-                self._reconstruct()
+                compiled = compile_moves(heuristic_algorithm)
 
                 # Check for success by comparing block against success condition and passthrough transition steps
-                if success_condition is None or self._heuristic_success(success_condition):
+                if success_condition is None or self._heuristic_success(success_condition, compiled):
+                    self._apply_compiled(compiled)
+                    self._history.extend(compiled.codes, self._cube_string)
+
                     # Repeat current face if last move was a lifting move
                     adj = 0 if success_condition else 1
-                    
+
                     # Add new rotations and break out of this loop
                     new_rotations += heuristic_algorithm
                     break
-
-                # Undo operations by reversing heuristic steps and applying the inverse steps, then rebuild cube mappings
-                for command in reversed(heuristic_algorithm.swapcase()):
-                    self._faces[command.upper()].rotate(self._pieces, command)
-                    self._state.pop()
-                self._reconstruct()
         
         # Return newly identified rotations or an empty string if there are none
         return new_rotations
     
-    def _heuristic_success(self, success_condition):
-        """ Verify that heuristic success condition is true by checking predicted adjacencies vs actual adjacencies """
-        return list(success_condition.adjacencies) == sorted([self._cube_map[piece] for piece in success_condition.true_indexes])
-
-    def _reconstruct(self):
-        """ Update cube string by appending all cube values in order to a string to save state, and remap (this is useful in case a center turn is ever added). """
-        self._cube_string = "".join([f.value for f in self._pieces])
-        self._remap_pieces()
-        new_adjacencies = [{self._cube_map[face] for face in piece.arrangement.true_indexes} for piece in self._pieces]
-        for x in range(0, len(self._pieces)):
-            self._pieces[x].adjacent_faces = new_adjacencies[x]
+    def _heuristic_success(self, success_condition, compiled: CompiledMoves = None):
+        """ Verify that heuristic success condition is true by checking predicted adjacencies vs actual adjacencies.
+            Given a compiled sequence, the check is made against the cube as it would be after the sequence, without applying it:
+            centers never move, so each facelet's face after the moves is the face of the facelet the permutation gathers from.
+        """
+        cube_map = self._cube_map
+        if compiled is None:
+            actual = [cube_map[piece] for piece in success_condition.true_indexes]
+        else:
+            table = compiled.table
+            actual = [cube_map[table[piece]] for piece in success_condition.true_indexes]
+        return list(success_condition.adjacencies) == sorted(actual)
+
+    def _apply_compiled(self, compiled: CompiledMoves):
+        """ Apply a compiled move sequence and update only the facelets the sequence touches.
+            Pieces keep their colors while they move, so a piece inherits the adjacencies of the position it came from. The move set has
+            no slice moves, so centers never move and the pinned centerpieces and face map stay valid without a remap.
+        """
+        self._cube_string = cube_string = compiled.apply(self._cube_string)
+        pieces = self._pieces
+        cube_map = self._cube_map
+        phase_facelets = self._phase_facelets
+        moved = [(pieces[index], pieces[source].adjacent_faces) for index, source in compiled.affected]
+        for piece, adjacent_faces in moved:
+            index = piece.index
+            piece.value = value = cube_string[index]
+            piece.adjacent_faces = adjacent_faces
+            piece.home_face = face = self._pinned_centerpieces[value]
+
+            # Keep the phase counts current by comparing the facelet before and after the move
+            phase = FACELET_PHASES[index]
+            if phase is not None:
+                home = index // CUBE_FACE_PIECES
+                phase_facelets[phase] += (face == home) - (cube_map[index] == home)
+            cube_map[index] = face
+
+    def phase_solved(self, heuristic: CubeHeuristics) -> bool:
+        """ Whether every piece a heuristic phase sets is in place, read from counts kept up to date as the cube turns. """
+        order = heuristic.value.order
+        return self._phase_facelets[order] == len(PHASE_FACELETS[order])
+
+    @property
+    def history(self) -> CubeHistory:
+        return self._history
+
+    @property
+    def face_map(self) -> Tuple[int, ...]:
+        """ The face index of every facelet, which is the cube with its colors relabeled by the center they match. """
+        return tuple(self._cube_map)
 
     def __str__(self):
         return self._cube_string
@@ -1,3 +1,5 @@
+import os
+
 import rubik.check as check
 import rubik.solve as solve
 import rubik.info as info
@@ -5,6 +7,8 @@ import rubik.info as info
 ERROR01 = 'error: no op is specified'
 ERROR02 = 'error: parameter is not a dictionary'
 ERROR03 = 'error: op is not legal'
+ERROR04 = 'error: batch is not a list'
+ERROR05 = 'error: batch has too many items'
 STATUS = 'status'
 OP = 'op'
 OPS = {
@@ -13,6 +17,14 @@ OPS = {
     'info': info._info,
 }
 
+# Every item of a batch runs in one request, so the item count is capped to keep one request from holding a worker for long
+BATCH_MAX_ITEMS_ENV = 'RUBIK_BATCH_MAX_ITEMS'
+DEFAULT_BATCH_MAX_ITEMS = 100
+
+
+def batch_max_items() -> int:
+    return int(os.environ.get(BATCH_MAX_ITEMS_ENV, DEFAULT_BATCH_MAX_ITEMS))
+
 
 def _dispatch(parms=None):
     result = {}
@@ -29,3 +41,53 @@ def _dispatch(parms=None):
     else:
         result = OPS[parms[OP]](parms)
     return result
+
+
+def _dispatch_stream(parms=None):
+    """ Dispatch a request as a stream of results: a solve yields a result per phase as it runs (see solve._solve_stream), every other
+        request yields the single result of _dispatch.
+    """
+    if isinstance(parms, dict) and parms.get(OP) == 'solve':
+        yield from solve._solve_stream(parms)
+    else:
+        yield _dispatch(parms)
+
+
+def _dispatch_item(parms):
+    """ Dispatch one item of a batch, turning an unexpected exception into an error status so that the rest of the batch still runs. """
+    try:
+        return _dispatch(parms)
+    except Exception as e:
+        return {STATUS: f"error: an exception occurred - {str(e)}"}
+
+
+def _batch_error(items):
+    """ The status of a batch that is turned away before any item runs: one that is not a list or has more than
+        RUBIK_BATCH_MAX_ITEMS items. Returns None for a batch that can run.
+    """
+    if not isinstance(items, list):
+        return ERROR04
+    if len(items) > batch_max_items():
+        return ERROR05
+    return None
+
+
+def _batch(items=None):
+    """ Dispatch every item of a list of parameter dicts in one call, sharing the solution cache and loaded tables between them.
+
+        @return list: one result per item in the format of _dispatch, or {'status': 'error: xxx'} if items is not a list or is too long
+    """
+    error = _batch_error(items)
+    if error is not None:
+        return {STATUS: error}
+    return [_dispatch_item(parms) for parms in items]
+
+
+def _batch_stream(items=None):
+    """ Dispatch a batch like _batch, yielding each result as soon as its item is done. """
+    error = _batch_error(items)
+    if error is not None:
+        yield {STATUS: error}
+        return
+    for parms in items:
+        yield _dispatch_item(parms)
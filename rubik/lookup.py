@@ -0,0 +1,163 @@
+import os
+import threading
+from typing import Dict, Optional
+
+from rubik.cube import CUBE_FACES, CUBE_FACE_PIECES, CUBE_PIECES, Cube, MOVE_GATHERS, MOVE_NAMES, format_moves
+from rubik.symmetry import SYMMETRIES, canonicalize
+from rubik.twophase import ALLOWED_FACES
+
+try:
+    import numpy as np
+    from rubik.vectorized import MOVE_ARRAYS
+except ImportError:
+    np = None
+
+N_MOVES = len(MOVE_NAMES)
+
+# Every state within this many face turns of solved is covered, each extra level costs roughly 13 times the memory of the last.
+# Solutions are stored once per symmetry class along with an 8 byte hash per state: depth 4 holds about a thousand classes in under
+# 2MB, depth 5 about 13 thousand in around 10MB
+LOOKUP_DEPTH_ENV = 'RUBIK_LOOKUP_DEPTH'
+DEFAULT_LOOKUP_DEPTH = 4
+
+# States are face maps as bytes (see Cube.face_map)
+SOLVED_STATE = bytes(face for face in range(CUBE_FACES) for _ in range(CUBE_FACE_PIECES))
+
+# Move codes allowed after a turn of each face, and first of all (index CUBE_FACES)
+ALLOWED_CODES = tuple(
+    np.array([code for face in ALLOWED_FACES[previous] for code in range(face * 3, face * 3 + 3)], dtype=np.uint8)
+    for previous in (*range(CUBE_FACES), None)
+) if np is not None else None
+
+# Rows of states are matched against the table by a 64-bit hash, a weighted sum of their facelets that wraps around
+STATE_WEIGHTS = np.random.default_rng(CUBE_PIECES).integers(1, 2 ** 63, size=CUBE_PIECES, dtype=np.uint64) if np is not None else None
+
+# Each symmetry as a gather over the facelets and a relabeling of the faces, to expand a symmetry class into all of its states
+SYMMETRY_GATHERS = np.array([symmetry.facelets for symmetry in SYMMETRIES], dtype=np.intp) if np is not None else None
+SYMMETRY_FACES = np.array([symmetry.faces for symmetry in SYMMETRIES], dtype=np.uint8) if np is not None else None
+
+
+def _inverse(code: int) -> int:
+    return code - code % 3 + 2 - code % 3
+
+
+def _hash_states(states):
+    with np.errstate(over='ignore'):
+        return states.astype(np.uint64) @ STATE_WEIGHTS
+
+
+class LookupTable:
+    """
+    Maps every cube within depth face turns of solved to an optimal solution. Cubes that are the same position seen in another
+    orientation, mirrored, or painted with other colors share one entry, keyed by their canonical face map (see symmetry.canonicalize)
+    with a solution for that canonical form, which is mapped back to the cube it is asked for.
+
+    Cubes up to twice as far away are solved by meeting in the middle: every sequence of up to depth turns is applied to the cube
+    until one lands in the table. Sequences are tried shortest first, so the first hit is also optimal. Rows of states are first
+    matched against a sorted array with the hash of every state the table covers, so that only hits are canonicalized.
+    """
+    def __init__(self, depth: int = DEFAULT_LOOKUP_DEPTH):
+        self.depth = depth
+        self._solutions: Dict[bytes, bytes] = {SOLVED_STATE: b''}
+
+        # Breadth-first from solved over canonical states, a state first reached by a move is solved by undoing it and then solving its
+        # parent, written for the canonical form the way cache.put_solution stores solutions
+        frontier = [SOLVED_STATE]
+        for _ in range(depth):
+            next_frontier = []
+            for state in frontier:
+                solution = self._solutions[state]
+                for code in range(N_MOVES):
+                    child, symmetry = canonicalize(MOVE_GATHERS[code](state))
+                    if child not in self._solutions:
+                        self._solutions[child] = bytes(symmetry.apply_moves((_inverse(code), *solution)))
+                        next_frontier.append(child)
+            frontier = next_frontier
+
+        self._hashes = None
+        if np is not None:
+            states = np.frombuffer(b''.join(self._solutions), dtype=np.uint8).reshape(-1, CUBE_PIECES)
+            self._hashes = np.unique(np.concatenate([
+                _hash_states(SYMMETRY_FACES[x][states[:, SYMMETRY_GATHERS[x]]]) for x in range(len(SYMMETRIES))
+            ]))
+
+    def __len__(self):
+        """ The number of symmetry classes held, each covering up to 48 states. """
+        return len(self._solutions)
+
+    def _covers(self, states):
+        """ Whether each row of states may be held by the table, a hash match that the exact lookup confirms. """
+        hashes = _hash_states(states)
+        found = np.minimum(np.searchsorted(self._hashes, hashes), len(self._hashes) - 1)
+        return self._hashes[found] == hashes
+
+    def get(self, state: bytes) -> Optional[bytes]:
+        """ The move codes of an optimal solution if the state is within depth turns of solved. """
+        # Most cubes are far from solved, the hash turns them away without canonicalizing
+        if self._hashes is not None and not self._covers(np.frombuffer(state, dtype=np.uint8)[None, :])[0]:
+            return None
+        canonical, symmetry = canonicalize(state)
+        solution = self._solutions.get(canonical)
+        return None if solution is None else bytes(symmetry.inverse.apply_moves(solution))
+
+    def solve(self, state: bytes) -> Optional[bytes]:
+        """ The move codes of an optimal solution if the state is within twice depth turns of solved, otherwise None.
+            Without numpy only states within depth turns are found.
+        """
+        solution = self.get(state)
+        if solution is not None or np is None:
+            return solution
+
+        # Expand every canonical move sequence from the cube one level at a time, as a batch of facelet rows with their moves so far.
+        # The first level to reach the table does so at its full depth, otherwise an earlier level would have hit, so the hit is optimal.
+        frontier = np.frombuffer(state, dtype=np.uint8)[None, :]
+        paths = np.zeros((1, 0), dtype=np.uint8)
+        previous = np.full(1, CUBE_FACES)
+        for _ in range(self.depth):
+            frontier, paths, previous = self._expand(frontier, paths, previous)
+            for row in np.flatnonzero(self._covers(frontier)):
+                # A hash can match a state the table does not hold, which the exact lookup then turns away
+                solution = self.get(frontier[row].tobytes())
+                if solution is not None:
+                    return paths[row].tobytes() + solution
+        return None
+
+    @staticmethod
+    def _expand(frontier, paths, previous):
+        """ Apply every move allowed after each row's last face to that row. """
+        frontiers, expanded_paths, faces = [], [], []
+        for face, codes in enumerate(ALLOWED_CODES):
+            rows = previous == face
+            if not rows.any():
+                continue
+            frontiers.append(frontier[rows][:, MOVE_ARRAYS[codes]].reshape(-1, CUBE_PIECES))
+            expanded_paths.append(np.concatenate((np.repeat(paths[rows], len(codes), axis=0), np.tile(codes, rows.sum())[:, None]), axis=1))
+            faces.append(np.tile(codes // 3, rows.sum()))
+        return np.concatenate(frontiers), np.concatenate(expanded_paths), np.concatenate(faces)
+
+
+_table = None
+_table_lock = threading.Lock()
+
+
+def get_table() -> LookupTable:
+    """ The table is built once per process on first use, at the depth set by RUBIK_LOOKUP_DEPTH. """
+    global _table
+    with _table_lock:
+        if _table is None:
+            _table = LookupTable(int(os.environ.get(LOOKUP_DEPTH_ENV, DEFAULT_LOOKUP_DEPTH)))
+    return _table
+
+
+def get(cube: Cube) -> Optional[str]:
+    """ An optimal solution as a move string if the cube is within the depth of the table, a single dictionary lookup. """
+    codes = get_table().get(bytes(cube.face_map))
+    return None if codes is None else format_moves(codes)
+
+
+def solve(cube: Cube) -> Optional[str]:
+    """ An optimal solution as a move string if the cube is close enough to solved for the table, otherwise None. Cubes beyond the
+        depth of the table are searched by meeting in the middle, which is only worth it ahead of a solver that takes longer still.
+    """
+    codes = get_table().solve(bytes(cube.face_map))
+    return None if codes is None else format_moves(codes)
@@ -0,0 +1,228 @@
+import argparse
+import time
+from typing import Dict, Optional, Tuple
+
+from rubik.coordinates import EDGES, MOVE_CUBIES, N_CORNER_PERMUTATION, N_TWIST, SOLVED_CUBIE, CubieCube
+from rubik.cube import Cube, MOVE_NAMES, format_moves
+from rubik.tables import Table, TableSet
+from rubik.twophase import ALLOWED_FACES
+import rubik.twophase as twophase
+from rubik.utils.exceptions import SearchLimitExceeded, TablesNotReady, TamperedCube
+
+N_MOVES = len(MOVE_NAMES)
+
+# The corner database covers every corner permutation and twist, indexed by corner_permutation * N_TWIST + twist
+N_CORNER_STATES = N_CORNER_PERMUTATION * N_TWIST
+
+# Each edge database tracks five edges, each edge as a digit holding its position and flip (position * 2 + flip).
+# A subset is indexed by its digits in base 24, which leaves gaps for impossible states but needs no ranking during the search.
+# Together the subsets cover all twelve edges, so a cube whose databases all read 0 is solved.
+EDGE_SUBSETS = ((0, 1, 2, 3, 4), (5, 6, 7, 8, 9), (7, 8, 9, 10, 11))
+N_EDGE_DIGITS = 2 * len(EDGES)
+N_EDGE_SUBSET_STATES = N_EDGE_DIGITS ** 5
+
+# Where each move takes each edge digit, one row per move code
+EDGE_DIGIT_MOVES = tuple(
+    tuple(
+        next(position * 2 + (digit + move.eo[position]) % 2 for position in range(len(EDGES)) if move.ep[position] == digit // 2)
+        for digit in range(N_EDGE_DIGITS)
+    )
+    for move in MOVE_CUBIES
+)
+SOLVED_EDGE_DIGITS = tuple(edge * 2 for edge in range(len(EDGES)))
+
+# Optimal solutions never need more than 20 face turns
+MAX_DEPTH = 20
+DEFAULT_MAX_NODES = 2000000
+DEFAULT_TIMEOUT = 10.0
+
+# Caps are checked every few thousand nodes rather than on every node
+CHECK_INTERVAL = 4096
+
+# Bump whenever a database layout changes, so that table files from older versions are regenerated
+TABLE_VERSION = 1
+
+
+def edge_subset_index(digits: Tuple[int, ...], subset: Tuple[int, ...]) -> int:
+    """ Index of a subset of edges in its database, given the digit of every edge. """
+    index = 0
+    for edge in reversed(subset):
+        index = index * N_EDGE_DIGITS + digits[edge]
+    return index
+
+
+def pack_nibbles(values) -> bytearray:
+    """ Pack distances into 4 bits each, two per byte with the even index in the low nibble. Values above 15 are stored as 15. """
+    import numpy as np
+
+    values = np.minimum(values, 15).astype(np.uint8)
+    if len(values) % 2:
+        values = np.append(values, np.uint8(15))
+    return bytearray((values[0::2] | (values[1::2] << 4)).tobytes())
+
+
+def nibble(table, index: int) -> int:
+    """ Read one 4-bit entry from a packed table. """
+    return (table[index >> 1] >> ((index & 1) << 2)) & 15
+
+
+def _breadth_first(size: int, goal: int, neighbours, chunk: int = 1 << 22):
+    """ Distance from the goal of every state, found level by level. States are expanded a chunk at a time to bound memory. """
+    import numpy as np
+
+    distance = np.full(size, 255, dtype=np.uint8)
+    distance[goal] = 0
+    depth = 0
+    found = True
+    while found:
+        found = False
+        for start in range(0, size, chunk):
+            states = np.flatnonzero(distance[start:start + chunk] == depth) + start
+            for code in range(N_MOVES):
+                targets = neighbours(states, code)
+                targets = targets[distance[targets] == 255]
+                distance[targets] = depth + 1
+                found = found or len(targets) > 0
+        depth += 1
+    return distance
+
+
+def build_tables() -> Dict[str, Table]:
+    """ Generate the corner and edge pattern databases. This needs numpy and about a minute, and peaks at a few hundred MB, which is
+        more than a worker is given, so it is only done ahead of deployment with python -m rubik.optimal --build.
+    """
+    import numpy as np
+
+    tables = twophase.TABLES.load()
+    corner_move = np.frombuffer(tables['corner_move'], dtype=np.uint16).reshape(-1, N_MOVES).astype(np.int64)
+    twist_move = np.frombuffer(tables['twist_move'], dtype=np.uint16).reshape(-1, N_MOVES).astype(np.int64)
+
+    def corner_neighbours(states, code):
+        permutation, twist = np.divmod(states, N_TWIST)
+        return corner_move[permutation, code] * N_TWIST + twist_move[twist, code]
+
+    digit_moves = np.array(EDGE_DIGIT_MOVES, dtype=np.int64)
+    weights = N_EDGE_DIGITS ** np.arange(5, dtype=np.int64)
+
+    def edge_neighbours(states, code):
+        digits = states[:, None] // weights % N_EDGE_DIGITS
+        return digit_moves[code][digits] @ weights
+
+    built = {'corner_pdb': pack_nibbles(_breadth_first(N_CORNER_STATES, 0, corner_neighbours))}
+    for x, subset in enumerate(EDGE_SUBSETS):
+        built[f'edge_pdb_{x}'] = pack_nibbles(_breadth_first(N_EDGE_SUBSET_STATES, edge_subset_index(SOLVED_EDGE_DIGITS, subset), edge_neighbours))
+    return built
+
+
+TABLES = TableSet('optimal', TABLE_VERSION, build_tables)
+
+
+class OptimalSolver:
+    """
+    IDA* over all 18 face turns, pruned by the largest of the corner and edge pattern database distances.
+    Each database gives the exact distance of its own pieces, which never overestimates the whole cube, so the first solution found
+    is optimal in the half turn metric. The search gives up with SearchLimitExceeded after max_nodes nodes or timeout seconds.
+    """
+    def __init__(self, tables: Dict[str, Table], max_nodes: int = DEFAULT_MAX_NODES, timeout: float = DEFAULT_TIMEOUT):
+        move_tables = twophase.get_tables()
+        self._corner_move = move_tables.corner_move
+        self._twist_move = move_tables.twist_move
+        self._corner_pdb = tables['corner_pdb']
+        self._edge_pdbs = tuple(tables[f'edge_pdb_{x}'] for x in range(len(EDGE_SUBSETS)))
+        self._max_nodes = max_nodes
+        self._timeout = timeout
+
+    def solve(self, cube: CubieCube) -> str:
+        """ Return an optimal move string solving the cube, or raise TamperedCube if the cube cannot be solved. """
+        if not cube.solvable:
+            raise TamperedCube(cube.to_string())
+
+        self._cube = cube
+        self._nodes = 0
+        self._deadline = time.monotonic() + self._timeout
+        self._moves = []
+
+        corner = cube.corner_permutation
+        twist = cube.twist
+        digits = tuple(position * 2 + cube.eo[position] for edge in range(len(EDGES)) for position in (cube.ep.index(edge),))
+        for depth in range(self._heuristic(corner, twist, digits), MAX_DEPTH + 1):
+            if self._search(corner, twist, digits, depth, None):
+                return format_moves(self._moves)
+        raise TamperedCube(cube.to_string())
+
+    def _heuristic(self, corner: int, twist: int, digits: Tuple[int, ...]) -> int:
+        return max(
+            nibble(self._corner_pdb, corner * N_TWIST + twist),
+            *(nibble(pdb, edge_subset_index(digits, subset)) for pdb, subset in zip(self._edge_pdbs, EDGE_SUBSETS))
+        )
+
+    def _search(self, corner: int, twist: int, digits: Tuple[int, ...], depth: int, previous: Optional[int]) -> bool:
+        # Children are only entered when every database reads less than the moves left, so with none left the cube is solved
+        if depth == 0:
+            return True
+        self._nodes += 1
+        if self._nodes % CHECK_INTERVAL == 0 and (self._nodes >= self._max_nodes or time.monotonic() > self._deadline):
+            raise SearchLimitExceeded(self._cube.to_string(), self._nodes)
+
+        corner_move, corner_row = self._corner_move, corner * N_MOVES
+        twist_move, twist_row = self._twist_move, twist * N_MOVES
+        corner_pdb = self._corner_pdb
+        edge_pdb_0, edge_pdb_1, edge_pdb_2 = self._edge_pdbs
+        for face in ALLOWED_FACES[previous]:
+            for code in range(face * 3, face * 3 + 3):
+                new_corner = corner_move[corner_row + code]
+                new_twist = twist_move[twist_row + code]
+                index = new_corner * N_TWIST + new_twist
+                if (corner_pdb[index >> 1] >> ((index & 1) << 2)) & 15 >= depth:
+                    continue
+
+                row = EDGE_DIGIT_MOVES[code]
+                a, b, c, d, e, f, g, h, i, j, k, l = new_digits = tuple([row[digit] for digit in digits])
+                index = (((e * 24 + d) * 24 + c) * 24 + b) * 24 + a
+                if (edge_pdb_0[index >> 1] >> ((index & 1) << 2)) & 15 >= depth:
+                    continue
+                index = (((j * 24 + i) * 24 + h) * 24 + g) * 24 + f
+                if (edge_pdb_1[index >> 1] >> ((index & 1) << 2)) & 15 >= depth:
+                    continue
+                index = (((l * 24 + k) * 24 + j) * 24 + i) * 24 + h
+                if (edge_pdb_2[index >> 1] >> ((index & 1) << 2)) & 15 >= depth:
+                    continue
+
+                self._moves.append(code)
+                if self._search(new_corner, new_twist, new_digits, depth - 1, face):
+                    return True
+                self._moves.pop()
+        return False
+
+
+_tables = None
+
+
+def get_tables() -> Dict[str, Table]:
+    """ Databases are mapped from the table file on first use. They are never generated here, a missing file raises TablesNotReady. """
+    global _tables
+    if _tables is None:
+        _tables = TABLES.read()
+        if _tables is None:
+            raise TablesNotReady(TABLES.name)
+    return _tables
+
+
+def solve(cube: Cube, max_nodes: int = DEFAULT_MAX_NODES, timeout: float = DEFAULT_TIMEOUT) -> str:
+    """ Solve a cube in the fewest possible face turns, returning the solution as a move string. """
+    cubie = CubieCube.from_cube(cube)
+    if cubie == SOLVED_CUBIE:
+        return ''
+    return OptimalSolver(get_tables(), max_nodes=max_nodes, timeout=timeout).solve(cubie)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Pattern databases for the optimal solver.')
+    parser.add_argument('--build', action='store_true', help='generate the databases into the tables directory unless they exist')
+    args = parser.parse_args()
+    if args.build:
+        twophase.TABLES.generate()
+        TABLES.generate()
+        print(f'Tables ready in {TABLES.path}')
+    else:
+        parser.print_help()
@@ -1,22 +1,59 @@
+import rubik.cache as cache
 import rubik.cube as rubik
+import rubik.lookup as lookup
+import rubik.optimal as optimal
+import rubik.twophase as twophase
 import re
-from rubik.utils.exceptions import SolveError, CubeError, InvalidRotateCommand
+from rubik.coordinates import check_solvable
+from itertools import islice
+from rubik.utils.exceptions import SolveError, CubeError, InvalidRotateCommand, InvalidSolveMethod
 
 VALID_ROTATIONS_REGEX = r"[frblud]"
+
+# Solvers selectable through the 'method' parameter, the layer method remains the default
+SOLVE_METHODS = ('layers', 'twophase', 'optimal')
+
+# Values of a flag parameter such as 'states', which asks a streamed solve to include the cube after every move
+TRUE_VALUES = (True, 'true', 'True', '1', 'yes')
     
     
 def _solve(parms):
     # Pull both required parameters
     cube = parms.get('cube')
     rotate_command = parms.get('rotate')
+    method = parms.get('method', 'layers')
 
     try:
+        if method not in SOLVE_METHODS:
+            raise InvalidSolveMethod(cube, method)
+
+        # Repeat solves are answered from the cache before a cube object is even built, once the cheap validation has passed
+        if rotate_command is None or rotate_command == '':
+            rubik.validate_cube(cube)
+            solution = cache.get_solution(cube, method)
+            if solution is not None:
+                return {"status": "ok", "solution": solution}
+
         # Create a cube object for processing
-        cube = rubik.Cube(input_cube=cube)
+        input_cube = cube
+        cube = rubik.Cube(input_cube=cube, history=False)
 
         # Pass valid rotation if it is empty
         if rotate_command is None or rotate_command == '':
-            return {"status": "ok", "solution": cube.solve(cube_phase=1)}
+            # Cubes that cannot be solved are turned away before any solver runs, rotating them is still allowed
+            check_solvable(cube.face_map, input_cube)
+
+            # Cubes a few turns from solved are answered from the lookup table before any solver runs. The layer method is faster than
+            # meeting in the middle, so it only takes direct hits
+            solution = lookup.get(cube) if method == 'layers' else lookup.solve(cube)
+            if solution is None and method == 'twophase':
+                solution = twophase.solve(cube)
+            elif solution is None and method == 'optimal':
+                solution = optimal.solve(cube)
+            elif solution is None:
+                solution = cube.solve(cube_phase=1)
+            cache.put_solution(input_cube, method, solution)
+            return {"status": "ok", "solution": solution}
         else:
             # Return a standardized copy of the rotate command if it contains 'Tt' and 'Uu' references. Only match in the presence of a 'Tt'
             if 't' in rotate_command or 'T' in rotate_command:
@@ -35,3 +72,88 @@ def _solve(parms):
     #     # Catch all other exceptions not handled above
     #     return {"status": f"error: exception caused by invalid cube configuration"}
     return {"status": "ok", "cube": str(cube)}
+
+
+
+def _solve_phases(cube: rubik.Cube, method: str):
+    """ Solve a cube the way _solve does while applying the moves to it, yielding (phase, None) for each phase once its moves are
+        applied and finally (None, solution) with the solution _solve would return. Cubes answered from the lookup table or by a
+        method without layers are solved in a single phase.
+    """
+    solution = lookup.get(cube) if method == 'layers' else lookup.solve(cube)
+    if solution is None and method == 'layers':
+        rotations = ''
+        for heuristic, phase_rotations in cube.solve_phases():
+            rotations += phase_rotations
+            yield heuristic.name, None
+        yield None, rubik.simplify_moves(rotations)
+        return
+
+    phase = 'lookup' if solution is not None else method
+    if solution is None and method == 'twophase':
+        solution = twophase.solve(cube)
+    elif solution is None:
+        solution = optimal.solve(cube)
+    cube.rotate(solution)
+    yield phase, None
+    yield None, solution
+
+
+def _cached_phases(cube: rubik.Cube, solution: str):
+    """ Replay a cached solution in the form of _solve_phases, as a single 'cache' phase. """
+    cube.rotate(solution)
+    yield 'cache', None
+    yield None, solution
+
+
+def _solve_stream(parms):
+    """ Streams a solve as it runs, yielding a result for every phase with the moves it applied, and when 'states' is set, the cube
+        after each of those moves. A cube answered from the solution cache yields a single 'cache' phase. The last result is the
+        complete solution as _solve returns it, or the error that stopped the solve, including unexpected exceptions, since by the
+        time one is raised the response is already being written. Rotations are not streamed, they yield the single result of _solve.
+
+        @return generator of dict: {'phase': xxx, 'moves': xxx[, 'states': [...]]}, ..., {'status': 'ok', 'solution': xxx}
+    """
+    cube = parms.get('cube')
+    rotate_command = parms.get('rotate')
+    method = parms.get('method', 'layers')
+    with_states = parms.get('states') in TRUE_VALUES
+
+    try:
+        if not (rotate_command is None or rotate_command == ''):
+            yield _solve(parms)
+            return
+
+        if method not in SOLVE_METHODS:
+            raise InvalidSolveMethod(cube, method)
+
+        input_cube = cube
+        rubik.validate_cube(cube)
+        solution = cache.get_solution(cube, method)
+        cube = rubik.Cube(input_cube=cube)
+        if solution is None:
+            check_solvable(cube.face_map, input_cube)
+            phases = _solve_phases(cube, method)
+        else:
+            phases = _cached_phases(cube, solution)
+
+        # Each phase reads its moves, and states when asked for, from the part of the history it added
+        history = cube.history
+        start = 0
+        for phase, solution in phases:
+            if phase is None:
+                break
+            stop = len(history)
+            result = {'phase': phase, 'moves': history.moves_between(start, stop)}
+            if with_states:
+                result['states'] = list(islice(history.states(start, stop), 1, None))
+            start = stop
+            yield result
+        cache.put_solution(input_cube, method, solution)
+    except (SolveError, CubeError) as e:
+        yield {"status": str(e)}
+        return
+    except Exception as e:
+        yield {"status": f"error: an exception occurred - {str(e)}"}
+        return
+    yield {"status": "ok", "solution": solution}
@@ -0,0 +1,116 @@
+from dataclasses import dataclass
+from itertools import permutations
+from operator import itemgetter
+from typing import Iterable, List, Sequence, Tuple
+
+from rubik.cube import (
+    ADJACENCY_ARRANGEMENTS, CUBE_FACES, CUBE_FACE_PIECES, CUBE_PIECES, ELEMENT_ARRANGEMENTS, OPPOSITE_FACES, PieceType, format_moves,
+    parse_moves
+)
+
+
+def _facelet_key(index: int) -> Tuple[int, frozenset]:
+    """ A facelet is identified by its face and the other faces its piece touches. """
+    face = index // CUBE_FACE_PIECES
+    return face, frozenset(ELEMENT_ARRANGEMENTS[index].adjacencies) - {face}
+
+
+FACELET_KEYS = tuple(_facelet_key(index) for index in range(CUBE_PIECES))
+FACELET_INDEXES = {key: index for index, key in enumerate(FACELET_KEYS)}
+
+# The clockwise order of the faces around each corner, as listed by its arrangement
+CORNER_ORDERS = tuple(
+    tuple(index // CUBE_FACE_PIECES for index in arrangement.true_indexes)
+    for arrangement in ADJACENCY_ARRANGEMENTS.values() if arrangement.piece_type == PieceType.CORNER.value
+)
+
+
+def _is_cyclic_shift(order: Tuple[int, ...], other: Tuple[int, ...]) -> bool:
+    return any(order[x:] + order[:x] == other for x in range(len(order)))
+
+
+@dataclass(frozen=True)
+class Symmetry:
+    """
+    A rotation or reflection of the whole cube.
+
+    faces: the face each face is carried to, which is also how the colors are relabeled so that the centers keep their face indexes
+    facelets: for each facelet, the facelet whose sticker is carried onto it
+    reflection: whether the symmetry mirrors the cube, which swaps the direction of every turn
+    """
+    faces: Tuple[int, ...]
+    facelets: Tuple[int, ...]
+    reflection: bool
+
+    @classmethod
+    def from_faces(cls, faces: Tuple[int, ...]) -> 'Symmetry':
+        """ Build the symmetry that carries each face f to faces[f], which must keep opposite faces opposite. """
+        facelets = [0] * CUBE_PIECES
+        for index, (face, adjacent) in enumerate(FACELET_KEYS):
+            facelets[FACELET_INDEXES[faces[face], frozenset(faces[x] for x in adjacent)]] = index
+
+        # A rotation keeps the clockwise order of the faces around every corner, a reflection reverses it
+        order = CORNER_ORDERS[0]
+        carried = tuple(faces[face] for face in order)
+        target = next(other for other in CORNER_ORDERS if set(other) == set(carried))
+        return cls(faces, tuple(facelets), not _is_cyclic_shift(carried, target))
+
+    def apply(self, faces: Sequence[int]) -> Tuple[int, ...]:
+        """ Transform a face map (see Cube.face_map): move every sticker and relabel its color. """
+        relabel = self.faces
+        return tuple(relabel[faces[index]] for index in self.facelets)
+
+    def apply_moves(self, codes: Iterable[int]) -> List[int]:
+        """ The moves that do to a transformed cube what the given moves do to the original. """
+        mapped = []
+        for code in codes:
+            face, turns = divmod(code, 3)
+            mapped.append(self.faces[face] * 3 + (2 - turns if self.reflection else turns))
+        return mapped
+
+    @property
+    def inverse(self) -> 'Symmetry':
+        faces = [0] * CUBE_FACES
+        for face, image in enumerate(self.faces):
+            faces[image] = face
+        return SYMMETRY_LOOKUP[tuple(faces)]
+
+
+def _opposite_preserving(faces: Tuple[int, ...]) -> bool:
+    return all(faces[OPPOSITE_FACES[face]] == OPPOSITE_FACES[faces[face]] for face in range(CUBE_FACES))
+
+
+# Every face permutation that keeps opposite faces opposite is a symmetry, the 24 rotations come first with the identity at 0
+SYMMETRIES = tuple(sorted(
+    (Symmetry.from_faces(faces) for faces in permutations(range(CUBE_FACES)) if _opposite_preserving(faces)),
+    key=lambda symmetry: symmetry.reflection
+))
+ROTATIONS = tuple(symmetry for symmetry in SYMMETRIES if not symmetry.reflection)
+SYMMETRY_LOOKUP = {symmetry.faces: symmetry for symmetry in SYMMETRIES}
+IDENTITY = SYMMETRIES[0]
+
+# Each symmetry as a gather over the facelets and a color translation, the fast path used when canonicalizing
+_TRANSFORMS = {
+    symmetry: (itemgetter(*symmetry.facelets), bytes.maketrans(bytes(range(CUBE_FACES)), bytes(symmetry.faces)))
+    for symmetry in SYMMETRIES
+}
+
+
+def canonicalize(faces: Sequence[int], symmetries: Sequence[Symmetry] = SYMMETRIES) -> Tuple[bytes, Symmetry]:
+    """ Map a face map to the smallest of its transforms under the given symmetries (every rotation and reflection by default),
+        returning it as bytes together with the symmetry that produced it. Two cubes that are the same position seen in another
+        orientation, mirrored, or painted with other colors get the same canonical form.
+    """
+    state = bytes(faces)
+    best = None
+    for symmetry in symmetries:
+        gather, relabel = _TRANSFORMS[symmetry]
+        candidate = bytes(gather(state)).translate(relabel)
+        if best is None or candidate < best[0]:
+            best = candidate, symmetry
+    return best
+
+
+def restore_solution(moves: str, symmetry: Symmetry) -> str:
+    """ Map a solution found for a canonical cube back to the cube it was canonicalized from. """
+    return format_moves(symmetry.inverse.apply_moves(parse_moves(moves)))
@@ -0,0 +1,245 @@
+import array
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+import zlib
+from typing import Callable, Dict, Optional, Union
+
+# Tables are written here, every worker on an instance maps the same file and so shares the same physical pages
+TABLES_DIR_ENV = 'RUBIK_TABLES_DIR'
+DEFAULT_TABLES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.tables')
+
+# File layout: a header, one directory entry per table, then each table's raw data aligned to 8 bytes
+MAGIC = b'RBKT'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sHcxII')     # magic, format version, byte order, table set version, table count
+ENTRY = struct.Struct('<32sc3xIQQ')    # name, array typecode, crc32 of the data, offset, size in bytes
+ALIGNMENT = 8
+BYTE_ORDER = b'<' if sys.byteorder == 'little' else b'>'
+
+# A lock file holds the id of the process generating the tables, and is taken over once that process has died. A lock file that
+# is still empty this long after it was created was left behind before its owner could write its id.
+EMPTY_LOCK_SECONDS = 5
+LOCK_POLL_SECONDS = 0.5
+
+# Requests wait at most this long for tables that are being generated, after which they are told the tables are not ready
+LOAD_TIMEOUT_ENV = 'RUBIK_TABLES_TIMEOUT'
+DEFAULT_LOAD_TIMEOUT = 5.0
+
+Table = Union[array.array, bytearray]
+
+
+def tables_dir() -> str:
+    return os.environ.get(TABLES_DIR_ENV) or DEFAULT_TABLES_DIR
+
+
+def load_timeout() -> float:
+    return float(os.environ.get(LOAD_TIMEOUT_ENV, DEFAULT_LOAD_TIMEOUT))
+
+
+def _align(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def write_tables(path: str, version: int, tables: Dict[str, Table]):
+    """ Write a table set to path. The file is written under a temporary name and renamed, so a reader never maps a partial file. """
+    entries = []
+    offset = _align(HEADER.size + ENTRY.size * len(tables))
+    for name, table in tables.items():
+        data = memoryview(table).cast('B')
+        typecode = table.typecode if isinstance(table, array.array) else 'B'
+        entries.append((name, typecode, data, offset))
+        offset = _align(offset + data.nbytes)
+
+    temporary = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    try:
+        with open(temporary, 'wb') as file:
+            file.write(HEADER.pack(MAGIC, FORMAT_VERSION, BYTE_ORDER, version, len(entries)))
+            for name, typecode, data, offset in entries:
+                file.write(ENTRY.pack(name.encode('ascii'), typecode.encode('ascii'), zlib.crc32(data), offset, data.nbytes))
+            for name, typecode, data, offset in entries:
+                file.write(bytes(offset - file.tell()))
+                file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, path)
+    finally:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+
+
+def read_tables(path: str, version: int) -> Optional[Dict[str, memoryview]]:
+    """ Map a table set read-only and return a typed view of each table.
+        Returns None if the file is missing, was written by another format or table version, or fails its checksums.
+    """
+    try:
+        with open(path, 'rb') as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    view = memoryview(mapped)
+    try:
+        magic, format_version, byte_order, file_version, count = HEADER.unpack_from(view)
+        if (magic, format_version, byte_order, file_version) != (MAGIC, FORMAT_VERSION, BYTE_ORDER, version):
+            raise ValueError(path)
+        entries = [ENTRY.unpack_from(view, HEADER.size + ENTRY.size * x) for x in range(count)]
+        for name, typecode, checksum, offset, size in entries:
+            if offset + size > len(view) or zlib.crc32(view[offset:offset + size]) != checksum:
+                raise ValueError(path)
+    except (struct.error, ValueError):
+        view.release()
+        mapped.close()
+        return None
+
+    return {
+        name.rstrip(b'\0').decode('ascii'): view[offset:offset + size].cast(typecode.decode('ascii'))
+        for name, typecode, checksum, offset, size in entries
+    }
+
+
+def _lock_owner_alive(path: str) -> bool:
+    """ Whether the process whose id is written in a lock file is still running. """
+    with open(path, 'rb') as file:
+        content = file.read().strip()
+    if not content:
+        return time.time() - os.path.getmtime(path) < EMPTY_LOCK_SECONDS
+    try:
+        os.kill(int(content), 0)
+    except (ValueError, ProcessLookupError):
+        return False
+    except PermissionError:
+        # The process exists but belongs to another user
+        return True
+    return True
+
+
+def _acquire_lock(path: str) -> int:
+    """ Take a lock file so that only one process on the instance generates a table set, the others wait for its file.
+        A lock left behind by a process that died while generating is removed and taken.
+    """
+    while True:
+        try:
+            descriptor = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            os.write(descriptor, str(os.getpid()).encode('ascii'))
+            return descriptor
+        except FileExistsError:
+            try:
+                if not _lock_owner_alive(path):
+                    os.remove(path)
+                    continue
+            except OSError:
+                continue
+            time.sleep(LOCK_POLL_SECONDS)
+
+
+def _release_lock(path: str, descriptor: int):
+    os.close(descriptor)
+    os.remove(path)
+
+
+class TableSet:
+    """
+    A named group of tables stored together in one file.
+
+    The first call to load() maps the file if it exists. Otherwise a background thread generates the tables with the build function,
+    writes them, and maps the result, while callers wait for it rather than building their own copy. Tables too large to generate
+    inside a worker are built ahead of deployment with generate() and only ever mapped with read(). Bump the version whenever the
+    build function changes what it produces, so that stale files are regenerated instead of loaded.
+    """
+    def __init__(self, name: str, version: int, build: Callable[[], Dict[str, Table]]):
+        self.name = name
+        self.version = version
+        self._build = build
+        self._tables = None
+        self._error = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+
+    @property
+    def path(self) -> str:
+        return os.path.join(tables_dir(), f'{self.name}-v{self.version}.tables')
+
+    @property
+    def ready(self) -> bool:
+        return self._tables is not None
+
+    def prepare(self):
+        """ Start generating the tables in the background if they are not already available, without waiting. """
+        with self._lock:
+            if self._tables is not None or self._thread is not None:
+                return
+            tables = read_tables(self.path, self.version)
+            if tables is not None:
+                self._tables = tables
+                self._ready.set()
+                return
+            self._error = None
+            self._ready.clear()
+            self._thread = threading.Thread(target=self._generate, name=f'rubik-tables-{self.name}', daemon=True)
+            self._thread.start()
+
+    def read(self) -> Optional[Dict[str, memoryview]]:
+        """ Map the tables if their file exists, without ever generating them. Returns None if there is no valid file. """
+        with self._lock:
+            if self._tables is None:
+                self._tables = read_tables(self.path, self.version)
+                if self._tables is not None:
+                    self._ready.set()
+            return self._tables
+
+    def generate(self) -> Dict[str, memoryview]:
+        """ Generate and write the tables in the calling thread unless a valid file already exists, for building ahead of deployment. """
+        with self._lock:
+            self._tables = self._generate_file()
+            self._ready.set()
+            return self._tables
+
+    def load(self, timeout: Optional[float] = None) -> Optional[Dict[str, memoryview]]:
+        """ Return the tables, waiting for them to be generated if needed. Returns None if they are not ready within the timeout. """
+        self.prepare()
+        self._ready.wait(timeout)
+        if self._error is not None:
+            raise self._error
+        return self._tables
+
+    def _generate(self):
+        try:
+            self._tables = self._generate_file()
+        except Exception as e:
+            self._error = e
+        finally:
+            # A failed generation can be retried by the next call to prepare()
+            self._thread = None
+            self._ready.set()
+
+    def _generate_file(self) -> Dict[str, memoryview]:
+        path = self.path
+        lock_path = f'{path}.lock'
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            lock = _acquire_lock(lock_path)
+        except OSError:
+            lock = None
+
+        try:
+            # Another process may have written the file while we waited for the lock
+            tables = read_tables(path, self.version)
+            if tables is not None:
+                return tables
+            built = self._build()
+            try:
+                write_tables(path, self.version, built)
+                tables = read_tables(path, self.version)
+            except OSError:
+                tables = None
+
+            # Without a writable directory each process keeps its own copy in memory
+            return tables or {name: memoryview(table) for name, table in built.items()}
+        finally:
+            if lock is not None:
+                _release_lock(lock_path, lock)
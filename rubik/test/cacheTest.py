@@ -0,0 +1,127 @@
+import os
+import tempfile
+import time
+import unittest
+import rubik.cache as cache
+import rubik.cube as rubik
+import rubik.solve as solve
+import rubik.symmetry as symmetry
+
+
+class CacheTest(unittest.TestCase):
+    SCRAMBLED = '443303302550412532534424421302132022001141100551555413'
+
+    def test_cache_010_ShouldEvictLeastRecentlyUsedEntry(self):
+        solutions = cache.SolutionCache(max_entries=2)
+        solutions.put(b'a', 'F')
+        solutions.put(b'b', 'R')
+        solutions.get(b'a')
+        solutions.put(b'c', 'U')
+        self.assertEqual('F', solutions.get(b'a'))
+        self.assertIsNone(solutions.get(b'b'))
+        self.assertEqual((2, 1), (solutions.hits, solutions.misses))
+
+    def test_cache_020_ShouldStayWithinByteBudget(self):
+        solutions = cache.SolutionCache(max_bytes=1024)
+        for x in range(100):
+            solutions.put(str(x).encode('ascii'), 'FRBLUD' * 10)
+        self.assertLessEqual(solutions.size, 1024)
+        self.assertLess(len(solutions), 100)
+
+    def test_cache_030_ShouldShareKeyBetweenRecoloredCubes(self):
+        recolored = self.SCRAMBLED.translate(str.maketrans('012345', 'bryogw'))
+        self.assertEqual(cache.normalize(self.SCRAMBLED), cache.normalize(recolored))
+
+    def test_cache_040_ShouldReturnCachedSolutionOnRepeatSolve(self):
+        cache.SOLUTIONS.clear()
+        parm = {'op': 'solve', 'cube': self.SCRAMBLED}
+        first = solve._solve(parm)
+        second = solve._solve(parm)
+        self.assertEqual(first, second)
+        self.assertEqual(1, cache.SOLUTIONS.hits)
+
+    def test_cache_050_ShouldMapSolutionBetweenSymmetricCubes(self):
+        cache.SOLUTIONS.clear()
+        faces = rubik.Cube(self.SCRAMBLED).face_map
+        mirrored = ''.join(map(str, symmetry.SYMMETRIES[-1].apply(faces)))
+
+        # Any solution of the cube can be stored, the layer method needs no generated tables
+        cache.put_solution(self.SCRAMBLED, 'twophase', solve._solve({'op': 'solve', 'cube': self.SCRAMBLED, 'method': 'layers'})['solution'])
+
+        cube = rubik.Cube(mirrored)
+        cube.rotate(cache.get_solution(mirrored, 'twophase'))
+        self.assertEqual(rubik.Cube('bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww').face_map, cube.face_map)
+
+    def test_cache_051_ShouldKeepLayerSolutionsToTheirOwnCube(self):
+        cache.SOLUTIONS.clear()
+        faces = rubik.Cube(self.SCRAMBLED).face_map
+        mirrored = ''.join(map(str, symmetry.SYMMETRIES[-1].apply(faces)))
+        solve._solve({'op': 'solve', 'cube': self.SCRAMBLED, 'method': 'layers'})
+        self.assertIsNone(cache.get_solution(mirrored, 'layers'))
+        self.assertEqual(solve._solve({'op': 'solve', 'cube': mirrored})['solution'], rubik.Cube(mirrored).solve(cube_phase=1))
+
+    def test_cache_060_ShouldShareSolutionsThroughDisk(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'cache.sqlite3')
+            cache.configure_disk_cache(path)
+            try:
+                cache.SOLUTIONS.clear()
+                solution = solve._solve({'op': 'solve', 'cube': self.SCRAMBLED})['solution']
+
+                # A fresh process starts with an empty memory cache but the same database
+                cache.SOLUTIONS.clear()
+                cache.configure_disk_cache(path)
+                self.assertEqual(solution, cache.get_solution(self.SCRAMBLED, 'layers'))
+                self.assertEqual(0, cache.SOLUTIONS.hits)
+            finally:
+                cache.configure_disk_cache(None)
+
+    def test_cache_070_ShouldEvictFromDiskBySize(self):
+        with tempfile.TemporaryDirectory() as directory:
+            disk = cache.DiskCache(os.path.join(directory, 'cache.sqlite3'), max_bytes=4096)
+            for x in range(cache.EVICTION_INTERVAL * 4):
+                disk.put(str(x).encode('ascii'), 'FRBLUD' * 10)
+            self.assertLessEqual(disk.size, 4096)
+            self.assertEqual('FRBLUD' * 10, disk.get(str(cache.EVICTION_INTERVAL * 4 - 1).encode('ascii')))
+
+    def test_cache_080_ShouldOnlyRefreshUseOfStaleEntries(self):
+        with tempfile.TemporaryDirectory() as directory:
+            disk = cache.DiskCache(os.path.join(directory, 'cache.sqlite3'))
+            disk.put(b'fresh', 'F')
+            disk.put(b'stale', 'R')
+            stale = time.time() - 2 * cache.USED_REFRESH_SECONDS
+            with disk._connection() as connection:
+                connection.execute('UPDATE entries SET used = ? WHERE key = ?', (stale, b'stale'))
+                fresh = connection.execute('SELECT used FROM entries WHERE key = ?', (b'fresh',)).fetchone()[0]
+
+            self.assertEqual('F', disk.get(b'fresh'))
+            self.assertEqual('R', disk.get(b'stale'))
+            with disk._connection() as connection:
+                used = dict(connection.execute('SELECT key, used FROM entries'))
+            self.assertEqual(fresh, used[b'fresh'])
+            self.assertGreater(used[b'stale'], stale)
+
+    def test_cache_910_ShouldNotNormalizeInvalidCube(self):
+        self.assertIsNone(cache.normalize('bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwww'))
+        self.assertIsNone(cache.normalize(None))
+
+    def test_cache_911_ShouldNotNormalizeControlCharacters(self):
+        # Control characters 0 to 5 are the bytes of the face indexes, they must not pass for the face they collide with
+        self.assertIsNone(cache.normalize(self.SCRAMBLED.replace('3', '\x03', 1)))
+
+    def test_cache_920_ShouldNotAnswerInvalidCubeFromCache(self):
+        self.assertEqual('ok', solve._solve({'op': 'solve', 'cube': self.SCRAMBLED})['status'])
+        result = solve._solve({'op': 'solve', 'cube': self.SCRAMBLED.replace('3', '\x03', 1)})
+        self.assertEqual({'status': 'error: invalid cube declaration - the cube contains invalid characters'}, result)
+
+    def test_cache_930_ShouldRunWithoutDiskWhenDatabaseCannotBeOpened(self):
+        with tempfile.TemporaryDirectory() as directory:
+            corrupt = os.path.join(directory, 'corrupt.sqlite3')
+            with open(corrupt, 'wb') as file:
+                file.write(b'not a database' * 512)
+            try:
+                self.assertIsNone(cache.configure_disk_cache(corrupt))
+                self.assertIsNone(cache.configure_disk_cache(os.path.join(directory, 'missing', 'cache.sqlite3')))
+                self.assertEqual('ok', solve._solve({'op': 'solve', 'cube': self.SCRAMBLED})['status'])
+            finally:
+                cache.configure_disk_cache(None)
@@ -53,18 +53,6 @@ class CheckTest(TestCase):
         status = result.get('status', None)
         self.assertEqual('ok', status)
 
-    def test_check_060_ShouldReturnOkOnNonStandardArrangementOfCornerPieces(self):
-        # This test is set to match a similar arrangement to EC, but it is perfectly solvable
-        # due to the relevant face pieces not being contiguous yet
-        parm = {
-            'op': 'check',
-            'cube': 'bbbbbbbbbrrrrrrrrrgggggggggooooooooowyyyyyyyyywwwwwwww'
-        }
-        result = check._check(parm)
-        self.assertIn('status', result)
-        status = result.get('status', None)
-        self.assertEqual('ok', status)
-
     def test_check_070_ShouldReturnOkOnScrambledCube(self):
         parm = {
             'op': 'check',
@@ -226,6 +214,17 @@ class CheckTest(TestCase):
         status = result.get('status', None)
         self.assertEqual('error: invalid cube configuration - the cube does not contain a valid arrangement of corner pieces', status)
 
+    def test_check_953_ShouldReturnErrorOnMirroredCornerPiece(self):
+        # Every corner has the right colors, but the white and yellow of one corner have been swapped, leaving its colors in mirrored order
+        parm = {
+            'op': 'check',
+            'cube': 'bbbbbbbbbrrrrrrrrrgggggggggooooooooowyyyyyyyyywwwwwwww'
+        }
+        result = check._check(parm)
+        self.assertIn('status', result)
+        status = result.get('status', None)
+        self.assertEqual('error: invalid cube configuration - the cube does not contain a valid arrangement of corner pieces', status)
+
     def test_check_960_ShouldReturnErrorOnInvalidArrangementOfEdgePieces(self):
         parm = {
             'op': 'check',
@@ -266,6 +265,54 @@ class CheckTest(TestCase):
         status = result.get('status', None)
         self.assertEqual('error: invalid cube configuration - the cube does not contain a valid arrangement of edge pieces', status)
 
+    def test_check_970_ShouldReturnErrorOfFirstInvalidPiece(self):
+        """ With both an edge and a corner invalid, the error names whichever piece comes first in the cube string. """
+        result = check._check({'op': 'check', 'cube': 'wwbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww'})
+        self.assertEqual('error: invalid cube configuration - the cube does not contain a valid arrangement of corner pieces', result['status'])
+
+        result = check._check({'op': 'check', 'cube': 'bwwbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww'})
+        self.assertEqual('error: invalid cube configuration - the cube does not contain a valid arrangement of edge pieces', result['status'])
+
+    def test_check_980_ShouldReturnErrorOnDuplicatePieces(self):
+        parm = {
+            'op': 'check',
+            'cube': 'rbbbbbbbbrrrorrrrrgggggggggoobooooooyyyyyyyyywwwwwwwww'
+        }
+        result = check._check(parm)
+        self.assertIn('status', result)
+        status = result.get('status', None)
+        self.assertEqual('error: invalid cube configuration - the cube contains the same piece more than once', status)
+
+    def test_check_981_ShouldReturnErrorOnTwistedCorner(self):
+        parm = {
+            'op': 'check',
+            'cube': 'obbbbbbbbrrrrrrrrrgggggggggooyooooooyyyyyybyywwwwwwwww'
+        }
+        result = check._check(parm)
+        self.assertIn('status', result)
+        status = result.get('status', None)
+        self.assertEqual('error: invalid cube configuration - a corner piece has been twisted', status)
+
+    def test_check_982_ShouldReturnErrorOnFlippedEdge(self):
+        parm = {
+            'op': 'check',
+            'cube': 'bybbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyybywwwwwwwww'
+        }
+        result = check._check(parm)
+        self.assertIn('status', result)
+        status = result.get('status', None)
+        self.assertEqual('error: invalid cube configuration - an edge piece has been flipped', status)
+
+    def test_check_983_ShouldReturnErrorOnSwappedPieces(self):
+        parm = {
+            'op': 'check',
+            'cube': 'brbbbybbbrrrbrrrrrgggggggggoooooooooyyyyyyybywwwwwwwww'
+        }
+        result = check._check(parm)
+        self.assertIn('status', result)
+        status = result.get('status', None)
+        self.assertEqual('error: invalid cube configuration - two pieces have been swapped', status)
+
     def test_check_990_ShouldReturnErrorIfFaceColorDoesNotOccurNineTimes(self):
         parm = {
             'op': 'check',
@@ -0,0 +1,40 @@
+import unittest
+import rubik.cube as rubik
+import rubik.coordinates as coordinates
+
+
+class CoordinatesTest(unittest.TestCase):
+    SCRAMBLED = '425100353215413244324524020151135105232040011024353543'
+
+    def test_coordinates_010_ShouldReadSolvedCube(self):
+        cube = rubik.Cube('bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww')
+        cubie = coordinates.CubieCube.from_cube(cube)
+        self.assertEqual(coordinates.SOLVED_CUBIE, cubie)
+        self.assertEqual(0, cubie.pack())
+
+    def test_coordinates_020_ShouldRoundTripScrambledCube(self):
+        cube = rubik.Cube(self.SCRAMBLED)
+        cubie = coordinates.CubieCube.from_cube(cube)
+        self.assertEqual(self.SCRAMBLED, cubie.to_string())
+        self.assertEqual(cubie, coordinates.CubieCube.from_packed(cubie.pack()))
+
+    def test_coordinates_030_ShouldMatchFaceletMoves(self):
+        cube = rubik.Cube(self.SCRAMBLED)
+        cubie = coordinates.CubieCube.from_cube(cube)
+        for command in 'FRBLUDfrbldu':
+            cubie = cubie.move(rubik.MOVE_CODES[command])
+        cube.rotate('FRBLUDfrbldu')
+        self.assertEqual(cube.face_map, cubie.to_faces())
+
+    def test_coordinates_910_ShouldRejectDuplicateCorner(self):
+        cube = rubik.Cube('bbbbbbbbbrrrrrrrrrgggggggggooooooooowyyyyyyyyywwwwwwww')
+        with self.assertRaises(rubik.InvalidCubeCorner):
+            coordinates.CubieCube.from_cube(cube)
+
+    def test_coordinates_920_ShouldNotBeSolvableWithTwistedCorner(self):
+        cubie = coordinates.CubieCube.from_faces(coordinates.SOLVED_FACES)
+        twisted = coordinates.CubieCube(cubie.cp, (1,) + cubie.co[1:], cubie.ep, cubie.eo)
+        self.assertTrue(cubie.solvable)
+        self.assertFalse(twisted.solvable)
+        with self.assertRaises(rubik.InvalidCubeTwist):
+            coordinates.check_solvable(twisted.to_faces())
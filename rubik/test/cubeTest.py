@@ -0,0 +1,167 @@
+import random
+import unittest
+import rubik.cube as rubik
+
+
+class CubeTest(unittest.TestCase):
+    SCRAMBLED = '425100353215413244324524020151135105232040011024353543'
+
+    # Every facelet labeled apart, and where each single turn of the original piece by piece rotation code moved those labels
+    LABELS = '0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQR'
+    ROTATED_LABELS = {
+        'F': '630741852GabHdeIghijklmnopqrsJuvKxyLABCDEFzwtfc9MNOPQR',
+        'R': '01L34O67Rfc9gdahebIjkFmnCpqrstuvwxyzAB2DE5GH8JKoMNlPQi',
+        'B': '0123456789aRcdQfgPolipmjqnkCstBvwAyzbehDEFGHIJKLMNOrux',
+        'L': 'A12D45G789abcdefghijPlmMopJxuryvszwtqBCnEFkHI0KL3NO6QR',
+        'U': '9ab345678ijkcdefghrstlmnopq012uvwxyzGDAHEBIFCJKLMNOPQR',
+        'D': '012345xyz9abcde678ijklmnfghrstuvwopqABCDEFGHIPMJQNKROL',
+        'f': '258147036LabKdeJghijklmnopqrsIuvHxyGABCDEF9cftwzMNOPQR',
+        'r': '01C34F67Ibehadg9cfRjkOmnLpqrstuvwxyzABoDElGHiJK2MN5PQ8',
+        'b': '0123456789aAcdBfgCknqjmpiloPstQvwRyzxurDEFGHIJKLMNOheb',
+        'l': 'J12M45P789abcdefghijGlmDopAtwzsvyrux0BC3EF6HIqKLnNOkQR',
+        'u': 'rst345678012cdefgh9ablmnopqijkuvwxyzCFIBEHADGJKLMNOPQR',
+        'd': '012345fgh9abcdeopqijklmnxyzrstuvw678ABCDEFGHILORKNQJMP',
+    }
+
+    # The first four skirt groups the original face objects appended on every cube, converted to 0-based facelets
+    FACE_SKIRTS = (
+        ((35, 32, 29), (42, 43, 44), (9, 12, 15), (47, 46, 45)),
+        ((8, 5, 2), (44, 41, 38), (18, 21, 24), (53, 50, 47)),
+        ((17, 14, 11), (38, 37, 36), (27, 30, 33), (51, 52, 53)),
+        ((26, 23, 20), (36, 39, 42), (0, 3, 6), (45, 48, 51)),
+        ((29, 28, 27), (20, 19, 18), (11, 10, 9), (2, 1, 0)),
+        ((33, 34, 35), (6, 7, 8), (15, 16, 17), (24, 25, 26)),
+    )
+
+    def test_cube_001_ShouldMatchOriginalRotationForEveryMove(self):
+        for move, rotated in self.ROTATED_LABELS.items():
+            self.assertEqual(rotated, rubik.apply_move(self.LABELS, rubik.MOVE_CODES[move]), move)
+            self.assertEqual(rotated, rubik.compile_moves(move).apply(self.LABELS), move)
+
+    def test_cube_002_ShouldMatchOriginalRotationForSequence(self):
+        cube = rubik.Cube(self.SCRAMBLED)
+        cube.rotate('FRBLUDfrblduFFuRRbLd')
+        self.assertEqual('331203353042214511454325201332034025011540405022154415', str(cube))
+
+    def test_cube_003_ShouldUndoMoveWithInverse(self):
+        for move in 'FRBLUD':
+            self.assertEqual(self.LABELS, rubik.compile_moves(move + move.lower()).apply(self.LABELS))
+            self.assertEqual(self.LABELS, rubik.compile_moves(move * 4).apply(self.LABELS))
+
+    def test_cube_004_ShouldCancelAndMergeTurnsOfOneFace(self):
+        self.assertEqual('', rubik.simplify_moves('FFff'))
+        self.assertEqual('f', rubik.simplify_moves('FFF'))
+        self.assertEqual('FFrUU', rubik.simplify_moves('FFRRRuu'))
+
+    def test_cube_005_ShouldMergeTurnsAcrossOppositeFace(self):
+        self.assertEqual('B', rubik.simplify_moves('FBf'))
+        self.assertEqual('U', rubik.simplify_moves('DUd'))
+
+    def test_cube_006_ShouldWriteOppositeFacesInFaceOrder(self):
+        self.assertEqual('FB', rubik.simplify_moves('BF'))
+        self.assertEqual('FB', rubik.simplify_moves('FB'))
+        self.assertEqual(rubik.simplify_moves('UDDR'), rubik.simplify_moves('DDUR'))
+
+    def test_cube_007_ShouldWriteHalfTurnsInHalfTurnMetric(self):
+        self.assertEqual('fB2', rubik.simplify_moves('FFFBB', rubik.TurnMetric.HALF))
+        self.assertEqual('F2rU2', rubik.simplify_moves('FFRRRuu', rubik.TurnMetric.HALF))
+        self.assertEqual('', rubik.simplify_moves('FFff', rubik.TurnMetric.HALF))
+
+    def test_cube_008_ShouldMatchOriginalFaceTopology(self):
+        self.assertEqual(self.FACE_SKIRTS, rubik.FACE_SKIRTS)
+        self.assertEqual(tuple(face * 9 + 4 for face in range(6)), rubik.FACE_CENTERS)
+        self.assertEqual(tuple(tuple(face * 9 + x for x in (1, 3, 5, 7)) for face in range(6)), rubik.FACE_EDGES)
+        self.assertEqual(tuple(tuple(face * 9 + x for x in (0, 2, 6, 8)) for face in range(6)), rubik.FACE_CORNERS)
+
+    def test_cube_009_ShouldShareFaceTopologyBetweenCubes(self):
+        cubes = [rubik.Cube(self.SCRAMBLED) for _ in range(3)]
+        self.assertEqual(self.FACE_SKIRTS, rubik.FACE_SKIRTS)
+        for cube in cubes:
+            for face, state in enumerate(cube._faces):
+                self.assertIs(rubik.FACE_SKIRTS[face], state.skirt)
+                self.assertEqual(list(rubik.FACE_EDGES[face]), [piece.index for piece in state.edges])
+                self.assertEqual(list(rubik.FACE_CORNERS[face]), [piece.index for piece in state.corners])
+
+    def test_cube_010_ShouldCacheCompiledMovesByNormalizedForm(self):
+        self.assertIs(rubik.compile_moves('FFFF'), rubik.compile_moves(''))
+        self.assertIs(rubik.compile_moves('FF'), rubik.compile_moves('ff'))
+
+    def test_cube_011_ShouldIndexArrangementsByFaceletAndAdjacency(self):
+        arrangements = [arrangement for arrangement in rubik.CubeArrangement if arrangement.name != 'PieceArrangement']
+        self.assertEqual(26, len(rubik.ADJACENCY_ARRANGEMENTS))
+        for index in range(rubik.CUBE_PIECES):
+            scanned = [arrangement for arrangement in arrangements if index in arrangement.true_indexes]
+            self.assertEqual(scanned, [rubik.CubeArrangement.get_arrangement_from_element(index)])
+        for arrangement in arrangements:
+            self.assertIs(arrangement, rubik.CubeArrangement.is_valid_adjacency(set(arrangement.adjacencies)))
+        self.assertIsNone(rubik.CubeArrangement.is_valid_adjacency({rubik.CubeFace.U.value, rubik.CubeFace.D.value}))
+
+    def test_cube_012_ShouldSelectPiecesFromIndexes(self):
+        pieces = rubik.Cube(self.SCRAMBLED)._pieces
+        for piece_type in (rubik.PieceType.EDGE, rubik.PieceType.CORNER):
+            for face in range(rubik.CUBE_FACES):
+                self.assertEqual(
+                    [piece for piece in pieces if piece.current_face == face and piece.arrangement.piece_type == piece_type.value],
+                    rubik.CubeArrangement.get_face_pieces(pieces, face, piece_type)
+                )
+                color = pieces[rubik.FACE_CENTERS[face]].value
+                cohesive = rubik.CubeArrangement.get_cohesive_pieces(pieces, color, piece_type)
+                self.assertEqual([piece for piece in pieces if piece.value == color and piece.arrangement.piece_type == piece_type.value], cohesive)
+                self.assertTrue(cohesive)
+
+    def test_cube_020_ShouldNotCacheLongMoves(self):
+        moves = 'FR' * rubik.COMPILE_CACHE_LENGTH
+        compiled = rubik.compile_moves(moves)
+        self.assertIsNot(compiled, rubik.compile_moves(moves))
+        self.assertEqual(compiled.table, rubik.compile_moves(moves).table)
+
+    def test_cube_030_ShouldRebuildEveryStateFromCheckpoints(self):
+        moves = random.Random(3).choices('FRBLUDfrblud', k=rubik.CubeHistory.CHECKPOINT_INTERVAL * 2 + 10)
+        cube = rubik.Cube(self.SCRAMBLED)
+        expected = [str(cube)]
+        for move in moves:
+            cube.rotate(move)
+            expected.append(str(cube))
+
+        history = cube.history
+        self.assertEqual(len(moves), len(history))
+        self.assertEqual(''.join(moves), history.moves)
+        self.assertEqual(expected, [history.state(x) for x in range(len(history) + 1)])
+        self.assertEqual(expected, list(history.states()))
+        self.assertEqual(expected[100:], list(history.states(100)))
+
+    def test_cube_031_ShouldNotRecordWithoutHistory(self):
+        cube = rubik.Cube(self.SCRAMBLED, history=False)
+        cube.rotate('FRBLUD' * 20)
+        self.assertEqual(0, len(cube.history))
+        self.assertEqual(rubik.compile_moves('FRBLUD' * 20).apply(self.SCRAMBLED), str(cube))
+
+    def _assert_matches_rebuilt(self, cube):
+        rebuilt = rubik.Cube(str(cube))
+        self.assertEqual(rebuilt._cube_map, cube._cube_map)
+        self.assertEqual(rebuilt._phase_facelets, cube._phase_facelets)
+        for piece, expected in zip(cube._pieces, rebuilt._pieces):
+            self.assertEqual(
+                (expected.value, expected.home_face, expected.adjacent_faces),
+                (piece.value, piece.home_face, piece.adjacent_faces),
+                piece.index
+            )
+
+    def test_cube_040_ShouldKeepIncrementalStateEqualToRecount(self):
+        generator = random.Random(5)
+        cube = rubik.Cube(self.SCRAMBLED)
+        for _ in range(50):
+            cube.rotate(''.join(generator.choices('FRBLUDfrblud', k=generator.randint(1, 12))))
+            self._assert_matches_rebuilt(cube)
+
+    def test_cube_041_ShouldKeepIncrementalStateEqualToRecountWhileSolving(self):
+        cube = rubik.Cube(self.SCRAMBLED)
+        for heuristic, rotations in cube.solve_phases():
+            self._assert_matches_rebuilt(cube)
+            self.assertTrue(cube.phase_solved(heuristic))
+
+    def test_cube_930_ShouldRejectStateBeyondHistory(self):
+        cube = rubik.Cube(self.SCRAMBLED)
+        cube.rotate('FR')
+        with self.assertRaises(IndexError):
+            cube.history.state(3)
@@ -1,4 +1,6 @@
-from unittest import TestCase
+import os
+from unittest import TestCase, mock
+import rubik.cache as cache
 import rubik.dispatch as dispatch
 
 
@@ -50,3 +52,60 @@ class DispatchTest(TestCase):
         result = dispatch._dispatch(parms)
         self.assertIn('status', result)
         self.assertEquals(result['status'], dispatch.ERROR03)
+
+    # Batch
+    def test100_050ShouldDispatchEveryItemOfBatch(self):
+        items = [
+            {'op': 'check', 'cube': 'bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww'},
+            {'op': 'solve', 'cube': 'bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww', 'rotate': 'F'},
+            {'op': 'nop'},
+            {'level': 3},
+        ]
+        result = dispatch._batch(items)
+        self.assertEqual([dispatch._dispatch(parms) for parms in items], result)
+        self.assertEqual('ok', result[0]['status'])
+        self.assertIn('cube', result[1])
+        self.assertEqual(dispatch.ERROR03, result[2]['status'])
+        self.assertEqual(dispatch.ERROR01, result[3]['status'])
+
+    def test100_060ShouldReturnEmptyBatch(self):
+        self.assertEqual([], dispatch._batch([]))
+
+    def test100_950ShouldErrOnBatchThatIsNotList(self):
+        for items in (None, {'op': 'check'}, 'check'):
+            result = dispatch._batch(items)
+            self.assertIn('status', result)
+            self.assertEqual(result['status'], dispatch.ERROR04)
+
+    def test100_955ShouldErrOnBatchWithTooManyItems(self):
+        items = [{'op': 'info'}] * (dispatch.DEFAULT_BATCH_MAX_ITEMS + 1)
+        self.assertEqual({'status': dispatch.ERROR05}, dispatch._batch(items))
+        self.assertEqual([{'status': dispatch.ERROR05}], list(dispatch._batch_stream(items)))
+
+        with mock.patch.dict(os.environ, {dispatch.BATCH_MAX_ITEMS_ENV: str(len(items))}):
+            self.assertEqual(len(items), len(dispatch._batch(items)))
+
+    def test100_960ShouldErrOnItemOfBatchThatIsNotDict(self):
+        result = dispatch._batch([['op', 'check'], None])
+        self.assertEqual([{'status': dispatch.ERROR02}, {'status': dispatch.ERROR01}], result)
+
+    # Streams
+    def test100_070ShouldStreamBatchInOrder(self):
+        items = [
+            {'op': 'check', 'cube': 'bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww'},
+            {'op': 'nop'},
+            None,
+        ]
+        self.assertEqual(dispatch._batch(items), list(dispatch._batch_stream(items)))
+
+    def test100_080ShouldStreamSinglePhaseOnSolvedCube(self):
+        parms = {'op': 'solve', 'cube': 'bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww'}
+        cache.SOLUTIONS.clear()
+        self.assertEqual([{'phase': 'lookup', 'moves': ''}, {'status': 'ok', 'solution': ''}], list(dispatch._dispatch_stream(parms)))
+
+    def test100_090ShouldStreamSingleResultForOtherOps(self):
+        self.assertEqual([dispatch._dispatch({'op': 'info'})], list(dispatch._dispatch_stream({'op': 'info'})))
+        self.assertEqual([{'status': dispatch.ERROR01}], list(dispatch._dispatch_stream()))
+
+    def test100_970ShouldStreamErrOnBatchThatIsNotList(self):
+        self.assertEqual([{'status': dispatch.ERROR04}], list(dispatch._batch_stream({'op': 'check'})))
@@ -0,0 +1,56 @@
+import unittest
+import rubik.cube as rubik
+import rubik.lookup as lookup
+import rubik.solve as solve
+
+
+class LookupTest(unittest.TestCase):
+    SOLVED = 'bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww'
+
+    def _scramble(self, moves):
+        cube = rubik.Cube(self.SOLVED)
+        cube.rotate(moves)
+        return cube
+
+    def test_lookup_010_ShouldStoreEveryStateWithinDepth(self):
+        # 1 solved state, 18 at one turn in 2 symmetry classes (quarter and half turns), and 243 at two turns in 9 classes
+        self.assertEqual(1 + 2 + 9, len(lookup.LookupTable(depth=2)))
+
+    def test_lookup_011_ShouldSolveEveryStateOfEachClass(self):
+        table = lookup.LookupTable(depth=2)
+        for first in rubik.MOVE_NAMES:
+            for second in ('', *rubik.MOVE_NAMES):
+                cube = self._scramble(first + second)
+                solution = rubik.format_moves(table.get(bytes(cube.face_map)))
+                self.assertLessEqual(len(rubik.simplify_moves(solution, rubik.TurnMetric.HALF).replace('2', '')), 1 if second == '' else 2)
+                cube.rotate(solution)
+                self.assertEqual(self.SOLVED, str(cube))
+
+    @unittest.skipIf(lookup.np is None, "numpy is needed to meet in the middle")
+    def test_lookup_020_ShouldSolveWithinTwiceDepth(self):
+        table = lookup.LookupTable(depth=2)
+        cube = self._scramble('FRRuB')
+        solution = table.solve(bytes(cube.face_map))
+        self.assertEqual(4, len(solution))
+
+        cube.rotate(rubik.format_moves(solution))
+        self.assertEqual(self.SOLVED, str(cube))
+
+    def test_lookup_030_ShouldReturnOptimalSolutionFromSolve(self):
+        result = solve._solve({'op': 'solve', 'cube': str(self._scramble('FRu'))})
+        self.assertEqual('ok', result.get('status'))
+        self.assertEqual('Urf', result.get('solution'))
+
+    def test_lookup_910_ShouldReturnNoneBeyondTwiceDepth(self):
+        table = lookup.LookupTable(depth=1)
+        self.assertIsNone(table.solve(bytes(self._scramble('FRu').face_map)))
+
+    @unittest.skipIf(lookup.np is None, "numpy is needed to meet in the middle")
+    def test_lookup_040_ShouldOnlySearchAheadOfSlowerMethods(self):
+        # Five turns is beyond the table but within reach of meeting in the middle, which only the twophase and optimal methods use
+        cube = str(self._scramble('FRRuBL'))
+        self.assertIsNone(lookup.get(rubik.Cube(cube)))
+        phases = [result.get('phase') for result in solve._solve_stream({'op': 'solve', 'cube': cube})][:-1]
+        self.assertEqual(['BottomCross', 'LowerLayer', 'MiddleLayer', 'LastLayer'], phases)
+        phases = [result.get('phase') for result in solve._solve_stream({'op': 'solve', 'cube': cube, 'method': 'twophase'})][:-1]
+        self.assertEqual(['lookup'], phases)
@@ -0,0 +1,60 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import rubik.cache as cache
+import rubik.cube as rubik
+import rubik.coordinates as coordinates
+import rubik.optimal as optimal
+import rubik.solve as solve
+import rubik.tables as tables
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, "numpy is needed to generate the pattern databases")
+class OptimalTest(unittest.TestCase):
+    SOLVED = 'bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww'
+
+    def _scramble(self, moves):
+        cube = rubik.Cube(self.SOLVED)
+        cube.rotate(moves)
+        return str(cube)
+
+    def test_optimal_010_ShouldPackNibbles(self):
+        packed = optimal.pack_nibbles(numpy.array([3, 12, 0, 7, 20]))
+        self.assertEqual([3, 12, 0, 7, 15], [optimal.nibble(packed, x) for x in range(5)])
+
+    def test_optimal_020_ShouldFindShortestSolution(self):
+        scrambled = self._scramble('FRuBBlD')
+        result = solve._solve({'op': 'solve', 'cube': scrambled, 'method': 'optimal'})
+        self.assertEqual('ok', result.get('status'))
+
+        solution = result.get('solution')
+        self.assertEqual(6, len(rubik.simplify_moves(solution, rubik.TurnMetric.HALF).replace('2', '')))
+        cube = rubik.Cube(scrambled)
+        cube.rotate(solution)
+        self.assertEqual(coordinates.SOLVED_FACES, cube.face_map)
+
+    @unittest.skipIf(optimal.TABLES.read() is None, "the pattern databases are built with python -m rubik.optimal --build")
+    def test_optimal_910_ShouldStopAtNodeLimit(self):
+        cube = rubik.Cube(self._scramble('FRuBlDfrUbLdFFRR'))
+        with self.assertRaises(rubik.SearchLimitExceeded):
+            optimal.solve(cube, max_nodes=optimal.CHECK_INTERVAL)
+
+    def test_optimal_920_ShouldReturnErrorWithoutBuildingMissingTables(self):
+        calls = []
+        saved = optimal._tables, optimal.TABLES
+        with tempfile.TemporaryDirectory() as directory, mock.patch.dict(os.environ, {tables.TABLES_DIR_ENV: directory}):
+            optimal._tables = None
+            optimal.TABLES = tables.TableSet('optimal', optimal.TABLE_VERSION, lambda: calls.append(1) or {})
+            try:
+                cache.SOLUTIONS.clear()
+                result = solve._solve({'op': 'solve', 'cube': '425100353215413244324524020151135105232040011024353543', 'method': 'optimal'})
+                self.assertEqual('error: the optimal tables are not ready, try again later', result.get('status'))
+                self.assertEqual([], calls)
+            finally:
+                optimal._tables, optimal.TABLES = saved
@@ -1,5 +1,8 @@
+import rubik.cache as cache
 import rubik.solve as solve
+import rubik.cube as rubik
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 
 
 class SolveTest(unittest.TestCase):
@@ -510,6 +513,97 @@ class SolveTest(unittest.TestCase):
         # solution = result.get('solution', None)
         # self.assertEqual(expected['solution'], solution)
 
+    def test_solve_055_ShouldSolveMiddleLayerWithMiddleEdgesOnTop(self):
+        """ Middle layer slots holding top edges are counted as unsolved rather than failing the solve. """
+        cube = 'wyggwgwwybgborrwrwywbwbbgbbggyyobyogryorgwooooorbyyrrr'
+        solution = rubik.Cube(cube).solve()
+
+        solved = rubik.Cube(cube)
+        solved.rotate(solution)
+        face_map = solved.face_map
+        self.assertTrue(all(face_map[index] == index // 9 for face in range(4) for index in range(face * 9 + 3, face * 9 + 9)))
+        self.assertTrue(all(face == 5 for face in face_map[45:54]))
+
+    def test_solve_056_ShouldTrackSolvedPhasesWhileTurning(self):
+        """ Phase counts kept up to date by turns agree with counting the pieces of the cube from scratch. """
+        cube = rubik.Cube('wwwwwwwwwrrrrrrrrrbbbbbbbbbooooooooogggggggggyyyyyyyyy')
+        phases = [rubik.CubeHeuristics.BottomCross, rubik.CubeHeuristics.LowerLayer, rubik.CubeHeuristics.MiddleLayer]
+        self.assertTrue(all(cube.phase_solved(phase) for phase in phases))
+
+        for moves in ['F', 'RUr', 'urURUFuf', 'URurufUF', 'ULul', 'fUF', 'BBLLddR']:
+            cube.rotate(moves)
+            fresh = rubik.Cube(str(cube))
+            for phase in phases:
+                self.assertEqual(fresh.phase_solved(phase), cube.phase_solved(phase))
+                self.assertEqual(phase.get_pieces_solved(cube._faces, cube._pieces) == 4, cube.phase_solved(phase))
+
+    def test_solve_057_ShouldSolveLastLayer(self):
+        """ A cube with only its top layer scrambled is finished with one orientation and one permutation lookup. """
+        cube = rubik.Cube('wwwwwwwwwrrrrrrrrrbbbbbbbbbooooooooogggggggggyyyyyyyyy')
+        cube.rotate('RUrURUUrFRUrufURuRURURuruRR')
+        solution = cube.solve()
+
+        self.assertEqual(sorted(cube.face_map), list(cube.face_map))
+        solved = rubik.Cube('wwwwwwwwwrrrrrrrrrbbbbbbbbbooooooooogggggggggyyyyyyyyy')
+        solved.rotate('RUrURUUrFRUrufURuRURURuruRR' + solution)
+        self.assertEqual('wwwwwwwwwrrrrrrrrrbbbbbbbbbooooooooogggggggggyyyyyyyyy', str(solved))
+
+    def test_solve_058_ShouldSolveWholeCube(self):
+        cube = '443303302550412532534424421302132022001141100551555413'
+        solved = rubik.Cube(cube)
+        solved.rotate(rubik.Cube(cube).solve())
+        self.assertEqual(sorted(solved.face_map), list(solved.face_map))
+
+    def test_solve_059_ShouldSolveCubeWithTurnedBottomLayer(self):
+        """ A bottom layer turned out of place has every bottom facelet set, but its sides must still be solved before the last layer. """
+        scrambled = rubik.Cube('gggggggggrrrrrrrrrbbbbbbbbbooooooooowwwwwwwwwyyyyyyyyy')
+        scrambled.rotate('dFRUrufRUrURUUr')
+        result = solve._solve({'op': 'solve', 'cube': str(scrambled)})
+        self.assertEqual('ok', result.get('status', None))
+
+        scrambled.rotate(result['solution'])
+        self.assertEqual(sorted(scrambled.face_map), list(scrambled.face_map))
+
+    def test_solve_060_ShouldSolveConcurrentCubesIndependently(self):
+        """ Cubes solved from a thread pool must not share face state, so each result matches its sequential solve. """
+        cubes = [
+            '443303302550412532534424421302132022001141100551555413',
+            '440502105425110222255123152041431410301045023533453334',
+            '105302150312115455333021045054432325444140232221453001',
+            '232502120330412143401523505411433315043540424215051052',
+            '510400103321113412401224421522330430230441345550555253',
+            '210505201400310003523121252535232334041445143134254514',
+        ]
+
+        # Solve the cube objects directly, through _solve every repeat would be answered from the solution cache
+        def solve_cube(cube):
+            return rubik.Cube(cube, history=False).solve(cube_phase=1)
+
+        expected = [solve_cube(cube) for cube in cubes * 4]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(solve_cube, cubes * 4))
+        self.assertEqual(expected, results)
+
+    def test_solve_061_ShouldReturnSimplifiedSolution(self):
+        """ Solutions are normalized, so no turns are left to merge or cancel, even across opposite faces. """
+        parm = {
+            'op'    : 'solve',
+            'cube'  : '443303302550412532534424421302132022001141100551555413',
+        }
+        result = solve._solve(parm)
+        self.assertEqual('ok', result.get('status', None))
+
+        solution = result.get('solution', None)
+        self.assertEqual(rubik.simplify_moves(solution), solution)
+
+    def test_solve_062_ShouldPassOverEdgesWithoutMiddleSlot(self):
+        """ After FF the front bottom edge sits on top, it belongs in no middle slot and is passed over instead of raising. """
+        cube = rubik.Cube('bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww')
+        cube.rotate('FF')
+        status, candidates = rubik.CubeHeuristics.MiddleLayer.get_candidates(cube._faces, cube._pieces, targeted=0)
+        self.assertEqual(rubik.CandidateStatus.FOUND, status)
+        self.assertEqual({0, 1}, candidates[0].adjacent_faces)
+
     # --------------------------------------------------------
     # SAD PATH TESTS
     # --------------------------------------------------------
@@ -616,3 +710,67 @@ class SolveTest(unittest.TestCase):
         # Verify that we have not sent a cube parameter on a failure case
         self.assertNotIn('cube', result)
 
+
+    def test_solve_950_ShouldReturnErrorOnUnsolvableCube(self):
+        """ A cube with one flipped edge is turned away before any solver runs, but can still be rotated. """
+        cube = 'bybbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyybywwwwwwwww'
+        for method in solve.SOLVE_METHODS:
+            result = solve._solve({'op': 'solve', 'cube': cube, 'method': method})
+            self.assertEqual('error: invalid cube configuration - an edge piece has been flipped', result.get('status', None))
+            self.assertNotIn('solution', result)
+
+        result = solve._solve({'op': 'solve', 'cube': cube, 'rotate': 'F'})
+        self.assertEqual('ok', result.get('status', None))
+
+    def test_solve_070_ShouldStreamEachPhaseOfSolve(self):
+        """ The streamed phases replay the moves of the solve and end with the same result as an ordinary solve. """
+        cube = 'rooywowobbgwbbowbyoryyywowybbwrgrgygrbgworbwyrgogryrgg'
+        cache.SOLUTIONS.clear()
+        results = list(solve._solve_stream({'op': 'solve', 'cube': cube, 'states': 'true'}))
+        self.assertEqual(solve._solve({'op': 'solve', 'cube': cube}), results[-1])
+        self.assertEqual(['BottomCross', 'LowerLayer', 'MiddleLayer', 'LastLayer'], [result['phase'] for result in results[:-1]])
+
+        replay = rubik.Cube(cube)
+        for result in results[:-1]:
+            codes = rubik.parse_moves(result['moves'])
+            self.assertEqual(len(codes), len(result['states']))
+            for code, state in zip(codes, result['states']):
+                replay.rotate(rubik.format_moves([code]))
+                self.assertEqual(state, str(replay))
+        self.assertTrue(all(len(set(str(replay)[x:x + 9])) == 1 for x in range(0, 54, 9)))
+
+    def test_solve_071_ShouldStreamSolveWithoutStates(self):
+        cube = 'rooywowobbgwbbowbyoryyywowybbwrgrgygrbgworbwyrgogryrgg'
+        results = list(solve._solve_stream({'op': 'solve', 'cube': cube}))
+        self.assertTrue(all('states' not in result for result in results))
+        self.assertEqual('ok', results[-1]['status'])
+
+    def test_solve_072_ShouldStreamSingleResultForRotation(self):
+        parm = {'op': 'solve', 'cube': 'gggggggggrrrrrrrrrbbbbbbbbbooooooooowwwwwwwwwyyyyyyyyy', 'rotate': 'R'}
+        self.assertEqual([solve._solve(parm)], list(solve._solve_stream(parm)))
+
+    def test_solve_073_ShouldStreamCachedSolutionAsSinglePhase(self):
+        cube = 'rooywowobbgwbbowbyoryyywowybbwrgrgygrbgworbwyrgogryrgg'
+        cache.SOLUTIONS.clear()
+        solution = solve._solve({'op': 'solve', 'cube': cube})['solution']
+        results = list(solve._solve_stream({'op': 'solve', 'cube': cube}))
+        self.assertEqual([{'phase': 'cache', 'moves': solution}, {'status': 'ok', 'solution': solution}], results)
+        self.assertEqual(1, cache.SOLUTIONS.hits)
+
+    def test_solve_951_ShouldStreamErrorOnUnsolvableCube(self):
+        results = list(solve._solve_stream({'op': 'solve', 'cube': 'bybbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyybywwwwwwwww'}))
+        self.assertEqual([{'status': 'error: invalid cube configuration - an edge piece has been flipped'}], results)
+
+    def test_solve_952_ShouldStreamErrorOnUnexpectedException(self):
+        def fail(cube, method):
+            raise RuntimeError('the solver failed')
+            yield
+
+        saved = solve._solve_phases
+        solve._solve_phases = fail
+        try:
+            cache.SOLUTIONS.clear()
+            results = list(solve._solve_stream({'op': 'solve', 'cube': 'rooywowobbgwbbowbyoryyywowybbwrgrgygrbgworbwyrgogryrgg'}))
+        finally:
+            solve._solve_phases = saved
+        self.assertEqual([{'status': 'error: an exception occurred - the solver failed'}], results)
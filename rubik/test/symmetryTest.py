@@ -0,0 +1,40 @@
+import unittest
+import rubik.cube as rubik
+import rubik.coordinates as coordinates
+import rubik.lookup as lookup
+import rubik.symmetry as symmetry
+
+
+class SymmetryTest(unittest.TestCase):
+    SCRAMBLED = '425100353215413244324524020151135105232040011024353543'
+
+    def test_symmetry_010_ShouldFindAllSymmetries(self):
+        self.assertEqual(48, len(symmetry.SYMMETRIES))
+        self.assertEqual(24, len(symmetry.ROTATIONS))
+        self.assertEqual(tuple(range(rubik.CUBE_PIECES)), symmetry.IDENTITY.facelets)
+
+    def test_symmetry_020_ShouldCommuteWithMoves(self):
+        faces = rubik.Cube(self.SCRAMBLED).face_map
+        for transform in symmetry.SYMMETRIES:
+            for code in range(len(rubik.MOVE_NAMES)):
+                moved = rubik.Cube(''.join(map(str, faces)))
+                moved.rotate(rubik.MOVE_NAMES[code])
+                transformed = rubik.Cube(''.join(map(str, transform.apply(faces))))
+                transformed.rotate(rubik.format_moves(transform.apply_moves([code])))
+                self.assertEqual(transform.apply(moved.face_map), transformed.face_map)
+
+    def test_symmetry_030_ShouldCanonicalizeRecoloredAndReorientedCubes(self):
+        faces = rubik.Cube(self.SCRAMBLED).face_map
+        canonical, _ = symmetry.canonicalize(faces)
+        for transform in symmetry.SYMMETRIES:
+            recolored = ''.join('bryogw'[face] for face in transform.apply(faces))
+            self.assertEqual(canonical, symmetry.canonicalize(rubik.Cube(recolored).face_map)[0])
+
+    def test_symmetry_040_ShouldRestoreSolutionOfCanonicalCube(self):
+        cube = rubik.Cube('bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww')
+        cube.rotate('FRuB')
+        canonical, transform = symmetry.canonicalize(cube.face_map)
+
+        solution = lookup.get_table().get(canonical)
+        cube.rotate(symmetry.restore_solution(rubik.format_moves(solution), transform))
+        self.assertEqual(coordinates.SOLVED_FACES, cube.face_map)
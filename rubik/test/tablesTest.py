@@ -0,0 +1,87 @@
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+from array import array
+from unittest import mock
+import rubik.tables as tables
+
+
+class TablesTest(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._directory.name, 'test-v1.tables')
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test_tables_010_ShouldRoundTripTables(self):
+        tables.write_tables(self.path, 1, {'moves': array('H', [0, 1, 40319]), 'pruning': bytearray([3, 255, 0, 7])})
+        loaded = tables.read_tables(self.path, 1)
+        self.assertEqual([0, 1, 40319], loaded['moves'].tolist())
+        self.assertEqual([3, 255, 0, 7], loaded['pruning'].tolist())
+
+    def test_tables_020_ShouldGenerateOnceAndLoadFromFile(self):
+        calls = []
+
+        def build():
+            calls.append(1)
+            return {'pruning': bytearray(range(10))}
+
+        with mock.patch.dict(os.environ, {tables.TABLES_DIR_ENV: self._directory.name}):
+            self.assertEqual(list(range(10)), tables.TableSet('test', 1, build).load()['pruning'].tolist())
+            self.assertEqual(list(range(10)), tables.TableSet('test', 1, build).load()['pruning'].tolist())
+        self.assertEqual(1, len(calls))
+
+    def test_tables_910_ShouldRejectOtherVersion(self):
+        tables.write_tables(self.path, 1, {'pruning': bytearray(16)})
+        self.assertIsNone(tables.read_tables(self.path, 2))
+
+    def test_tables_920_ShouldRejectCorruptedTable(self):
+        tables.write_tables(self.path, 1, {'pruning': bytearray(16)})
+        with open(self.path, 'r+b') as file:
+            file.seek(-1, os.SEEK_END)
+            file.write(b'\x01')
+        self.assertIsNone(tables.read_tables(self.path, 1))
+
+    def test_tables_930_ShouldRejectMissingFile(self):
+        self.assertIsNone(tables.read_tables(self.path, 1))
+
+    def test_tables_030_ShouldTakeOverLockOfDeadProcess(self):
+        finished = subprocess.Popen([sys.executable, '-c', ''])
+        finished.wait()
+        lock_path = f'{self.path}.lock'
+        with open(lock_path, 'w') as file:
+            file.write(str(finished.pid))
+        lock = tables._acquire_lock(lock_path)
+        with open(lock_path) as file:
+            self.assertEqual(str(os.getpid()), file.read())
+        tables._release_lock(lock_path, lock)
+
+    def test_tables_040_ShouldKeepLockOfLiveProcess(self):
+        lock_path = f'{self.path}.lock'
+        with open(lock_path, 'w') as file:
+            file.write(str(os.getpid()))
+        self.assertTrue(tables._lock_owner_alive(lock_path))
+
+    def test_tables_050_ShouldReadWithoutGenerating(self):
+        with mock.patch.dict(os.environ, {tables.TABLES_DIR_ENV: self._directory.name}):
+            table_set = tables.TableSet('test', 1, lambda: {'pruning': bytearray(4)})
+            self.assertIsNone(table_set.read())
+            table_set.generate()
+            self.assertEqual([0, 0, 0, 0], tables.TableSet('test', 1, None).read()['pruning'].tolist())
+
+    def test_tables_940_ShouldStopWaitingAfterTimeout(self):
+        release = threading.Event()
+
+        def build():
+            release.wait()
+            return {'pruning': bytearray(4)}
+
+        with mock.patch.dict(os.environ, {tables.TABLES_DIR_ENV: self._directory.name}):
+            table_set = tables.TableSet('test', 1, build)
+            self.assertIsNone(table_set.load(timeout=0.05))
+            release.set()
+            self.assertEqual([0, 0, 0, 0], table_set.load()['pruning'].tolist())
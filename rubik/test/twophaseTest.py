@@ -0,0 +1,62 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+import rubik.cache as cache
+import rubik.cube as rubik
+import rubik.coordinates as coordinates
+import rubik.solve as solve
+import rubik.tables as tables
+import rubik.twophase as twophase
+
+
+class TwoPhaseTest(unittest.TestCase):
+    SCRAMBLED = '425100353215413244324524020151135105232040011024353543'
+
+    @classmethod
+    def setUpClass(cls):
+        # The tables are not checked in, a fresh checkout generates them once into the tables directory and later runs map the file
+        twophase.TABLES.generate()
+
+    def test_twophase_010_ShouldSolveScrambledCube(self):
+        result = solve._solve({'op': 'solve', 'cube': self.SCRAMBLED, 'method': 'twophase'})
+        self.assertEqual('ok', result.get('status'))
+
+        # Half turns are written as doubled letters, so measure the length in the half turn metric
+        solution = result.get('solution')
+        self.assertLessEqual(len(rubik.simplify_moves(solution, rubik.TurnMetric.HALF).replace('2', '')), 24)
+
+        cube = rubik.Cube(self.SCRAMBLED)
+        cube.rotate(solution)
+        self.assertEqual(coordinates.SOLVED_FACES, cube.face_map)
+
+    def test_twophase_020_ShouldReturnEmptySolutionOnSolvedCube(self):
+        cube = rubik.Cube('bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww')
+        self.assertEqual('', twophase.solve(cube))
+
+    def test_twophase_910_ShouldReturnErrorOnInvalidMethod(self):
+        result = solve._solve({'op': 'solve', 'cube': self.SCRAMBLED, 'method': 'fastest'})
+        self.assertEqual('error: the solve method is invalid', result.get('status'))
+
+    def test_twophase_920_ShouldRejectTwistedCorner(self):
+        solved = coordinates.SOLVED_CUBIE
+        twisted = coordinates.CubieCube(solved.cp, (1,) + solved.co[1:], solved.ep, solved.eo)
+        with self.assertRaises(rubik.TamperedCube):
+            twophase.TwoPhaseSolver(twophase.get_tables()).solve(twisted)
+
+    def test_twophase_930_ShouldReturnErrorWhileTablesAreGenerated(self):
+        release = threading.Event()
+        saved = twophase._tables, twophase.TABLES
+        with tempfile.TemporaryDirectory() as directory, mock.patch.dict(
+            os.environ, {tables.TABLES_DIR_ENV: directory, tables.LOAD_TIMEOUT_ENV: '0.05'}
+        ):
+            twophase._tables = None
+            twophase.TABLES = tables.TableSet('twophase', twophase.TABLE_VERSION, lambda: release.wait() and {})
+            try:
+                cache.SOLUTIONS.clear()
+                result = solve._solve({'op': 'solve', 'cube': self.SCRAMBLED, 'method': 'twophase'})
+                self.assertEqual('error: the twophase tables are not ready, try again later', result.get('status'))
+            finally:
+                release.set()
+                twophase._tables, twophase.TABLES = saved
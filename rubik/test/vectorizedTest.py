@@ -0,0 +1,46 @@
+import unittest
+import rubik.cube as rubik
+
+try:
+    import rubik.vectorized as vectorized
+except ImportError:
+    vectorized = None
+
+
+@unittest.skipIf(vectorized is None, "numpy is not installed")
+class VectorizedTest(unittest.TestCase):
+    CUBES = [
+        'bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww',
+        '544204041130114012542220402110535323513045102534352533',
+        'OBRRBBBGWGBRWWRRGOYGWYGWGYBRGWOYBOROBOBYRYGOYWWGWORYOY',
+        'rooywowobbgwbbowbyoryyywowybbwrgrgygrbgworbwyrgogryrgg',
+    ]
+
+    def test_vectorized_010_ShouldMatchScalarRotation(self):
+        batch = vectorized.CubeBatch.from_strings(self.CUBES)
+        batch.rotate('DDRRdfblbLfDDFrBBdlbUUFFlRfUUbLLR').rotate(0)
+
+        expected = []
+        for cube_string in self.CUBES:
+            cube = rubik.Cube(cube_string)
+            cube.rotate('DDRRdfblbLfDDFrBBdlbUUFFlRfUUbLLRF')
+            expected.append("".join(str(face) for face in cube._cube_map))
+        self.assertEqual(expected, batch.to_strings())
+
+    def test_vectorized_020_ShouldDetectSolvedCubes(self):
+        batch = vectorized.CubeBatch.from_strings(self.CUBES)
+        self.assertEqual([True, False, False, False], batch.solved.tolist())
+
+        batch.rotate('FRrf')
+        self.assertEqual([True, False, False, False], batch.solved.tolist())
+
+    def test_vectorized_030_ShouldMatchCubeValidation(self):
+        cubes = [
+            'bbbbbbbbbrrrrrrrrrgggggggggoooooooooyyyyyyyyywwwwwwwww',
+            'bbbbbbbbbgrrrrrrrrrggggggggoooooooooyyyyyyyyywwwwwwwww',
+            'rooywowobbgwrbowbyoryyywowybbwrgrgygrbgwobbwyrgogryrgg',
+            'OBRRBBBGWGBRWWRRGOYGWYGWGYBRGWOYBOROBOBYBYGOYWWGWORYOY',
+            'bbbbbbbbbrrrrrrrrrggggggggooooooooooyyyyyyyyywwwwwwwww',
+        ]
+        batch = vectorized.CubeBatch.from_strings(cubes)
+        self.assertEqual([True, False, False, False, False], batch.valid.tolist())
@@ -0,0 +1,338 @@
+import time
+from array import array
+from itertools import combinations
+from typing import Dict, Optional, Sequence, Tuple
+
+from rubik.coordinates import (
+    CubieCube, EDGES, MOVE_CUBIES, N_CORNER_PERMUTATION, N_FLIP, N_TWIST, SOLVED_CUBIE, rank_permutation, unrank_permutation
+)
+from rubik.cube import CUBE_FACES, Cube, CubeFace, MOVE_NAMES, OPPOSITE_FACES, format_moves
+from rubik.tables import Table, TableSet, load_timeout
+from rubik.utils.exceptions import TablesNotReady, TamperedCube
+
+N_MOVES = len(MOVE_NAMES)
+
+# The UD-slice holds the four edges touching neither U nor D, phase 1 gathers them into the slice while fixing all orientations
+SLICE_POSITIONS = tuple(x for x, arrangement in enumerate(EDGES) if not arrangement.adjacencies & {CubeFace.U.value, CubeFace.D.value})
+UD_POSITIONS = tuple(x for x in range(len(EDGES)) if x not in SLICE_POSITIONS)
+SLICE_COMBINATIONS = tuple(combinations(range(len(EDGES)), len(SLICE_POSITIONS)))
+SLICE_COMBINATION_INDEX = {positions: x for x, positions in enumerate(SLICE_COMBINATIONS)}
+N_SLICE = len(SLICE_COMBINATIONS)
+N_SLICE_PERMUTATION = 24
+N_SLICE_SORTED = N_SLICE * N_SLICE_PERMUTATION
+N_UD_EDGES = N_CORNER_PERMUTATION
+
+# Phase 2 keeps the cube inside <U, D, R2, L2, F2, B2>, quarter turns are only allowed on U and D
+PHASE2_MOVES = tuple(
+    code for code in range(N_MOVES)
+    if code // 3 in (CubeFace.U.value, CubeFace.D.value) or code % 3 == 1
+)
+
+PHASE2_FACE_MOVES = tuple(tuple(code for code in range(face * 3, face * 3 + 3) if code in PHASE2_MOVES) for face in range(CUBE_FACES))
+
+# Phase 1 can take at most 12 moves and phase 2 at most 18
+PHASE1_MAX_DEPTH = 12
+PHASE2_MAX_DEPTH = 18
+UNVISITED = 255
+
+# Bump whenever the table layout or the coordinates change, so that table files from older versions are regenerated
+TABLE_VERSION = 1
+
+
+def _allowed_after(previous: Optional[int]) -> Tuple[Tuple[int, ...], ...]:
+    """ Moves worth trying after a move on the given face: never the same face again, and opposite faces only in face order. """
+    allowed = []
+    for face in range(CUBE_FACES):
+        if previous is not None and (face == previous or (face == OPPOSITE_FACES[previous] and face < previous)):
+            continue
+        allowed.append(face)
+    return tuple(allowed)
+
+
+ALLOWED_FACES = {previous: _allowed_after(previous) for previous in (None, *range(CUBE_FACES))}
+
+
+def slice_sorted(ep: Tuple[int, ...]) -> int:
+    """ Which positions hold the four slice edges and in what order, 0 <= coordinate < 11880. """
+    positions = tuple(x for x, edge in enumerate(ep) if edge in SLICE_POSITIONS)
+    order = tuple(SLICE_POSITIONS.index(ep[position]) for position in positions)
+    return SLICE_COMBINATION_INDEX[positions] * N_SLICE_PERMUTATION + rank_permutation(order)
+
+
+def ud_edges(ep: Tuple[int, ...]) -> int:
+    """ The order of the eight U and D edges within the U and D layers, only meaningful once phase 1 is complete. """
+    return rank_permutation(tuple(UD_POSITIONS.index(ep[position]) for position in UD_POSITIONS))
+
+
+# The slice position of the solved cube, which phase 1 brings the slice edges to
+SLICE_GOAL = slice_sorted(SOLVED_CUBIE.ep) // N_SLICE_PERMUTATION
+
+
+def _slice_sorted_cube(coordinate: int) -> Tuple[int, ...]:
+    """ An edge permutation with the given slice coordinate, other edges fill the remaining positions in order. """
+    combination, order = divmod(coordinate, N_SLICE_PERMUTATION)
+    positions = SLICE_COMBINATIONS[combination]
+    slice_edges = iter(SLICE_POSITIONS[x] for x in unrank_permutation(order, len(SLICE_POSITIONS)))
+    other_edges = iter(UD_POSITIONS)
+    return tuple(next(slice_edges) if x in positions else next(other_edges) for x in range(len(EDGES)))
+
+
+def _ud_edges_cube(coordinate: int) -> Tuple[int, ...]:
+    ep = list(range(len(EDGES)))
+    for position, x in zip(UD_POSITIONS, unrank_permutation(coordinate, len(UD_POSITIONS))):
+        ep[position] = UD_POSITIONS[x]
+    return tuple(ep)
+
+
+def _build_move_table(size: int, from_coordinate, to_coordinate, moves=range(N_MOVES)) -> array:
+    """ Tabulate where every move takes every value of a coordinate, the entry for a move is at coordinate * N_MOVES + move code. """
+    table = array('H', bytes(2 * size * N_MOVES))
+    for coordinate in range(size):
+        cube = from_coordinate(coordinate)
+        row = coordinate * N_MOVES
+        for code in moves:
+            table[row + code] = to_coordinate(cube.multiply(MOVE_CUBIES[code]))
+    return table
+
+
+def _build_pruning_table(size_a: int, size_b: int, table_a, table_b, goal_a: int, goal_b, moves=range(N_MOVES)) -> bytearray:
+    """ Breadth-first search over the product of two coordinates from the goal, storing the exact distance for each pair.
+        This distance never overestimates the moves left to solve, so it is an admissible pruning heuristic.
+    """
+    pruning = bytearray([UNVISITED]) * (size_a * size_b)
+    frontier = [goal_a * size_b + b for b in goal_b]
+    for index in frontier:
+        pruning[index] = 0
+    depth = 0
+    while frontier:
+        next_frontier = []
+        depth += 1
+        for index in frontier:
+            a, b = divmod(index, size_b)
+            row_a = a * N_MOVES
+            row_b = b * N_MOVES
+            for code in moves:
+                target = table_a[row_a + code] * size_b + table_b[row_b + code]
+                if pruning[target] == UNVISITED:
+                    pruning[target] = depth
+                    next_frontier.append(target)
+        frontier = next_frontier
+    return pruning
+
+
+def build_tables() -> Dict[str, Table]:
+    """ Generate every move and pruning table used by the solver, this takes around half a minute. """
+    twist_move = _build_move_table(
+        N_TWIST,
+        lambda twist: CubieCube.from_coordinates(twist, 0, 0, 0),
+        lambda cube: cube.twist
+    )
+    flip_move = _build_move_table(
+        N_FLIP,
+        lambda flip: CubieCube.from_coordinates(0, flip, 0, 0),
+        lambda cube: cube.flip
+    )
+    slice_sorted_move = _build_move_table(
+        N_SLICE_SORTED,
+        lambda coordinate: CubieCube(SOLVED_CUBIE.cp, SOLVED_CUBIE.co, _slice_sorted_cube(coordinate), SOLVED_CUBIE.eo),
+        lambda cube: slice_sorted(cube.ep)
+    )
+    corner_move = _build_move_table(
+        N_CORNER_PERMUTATION,
+        lambda coordinate: CubieCube(unrank_permutation(coordinate, 8), SOLVED_CUBIE.co, SOLVED_CUBIE.ep, SOLVED_CUBIE.eo),
+        lambda cube: cube.corner_permutation
+    )
+    ud_edges_move = _build_move_table(
+        N_UD_EDGES,
+        lambda coordinate: CubieCube(SOLVED_CUBIE.cp, SOLVED_CUBIE.co, _ud_edges_cube(coordinate), SOLVED_CUBIE.eo),
+        lambda cube: ud_edges(cube.ep),
+        PHASE2_MOVES
+    )
+
+    # The slice position is the sorted coordinate of the first ordering, and in phase 2 the slice edges stay within the goal position
+    rows = N_SLICE_PERMUTATION * N_MOVES
+    slice_move = array('H', (coordinate // N_SLICE_PERMUTATION for x in range(0, len(slice_sorted_move), rows) for coordinate in slice_sorted_move[x:x + N_MOVES]))
+    slice_permutation_move = array('H', (coordinate % N_SLICE_PERMUTATION for coordinate in slice_sorted_move[SLICE_GOAL * rows:(SLICE_GOAL + 1) * rows]))
+
+    return {
+        'twist_move': twist_move,
+        'flip_move': flip_move,
+        'slice_move': slice_move,
+        'corner_move': corner_move,
+        'ud_edges_move': ud_edges_move,
+        'slice_permutation_move': slice_permutation_move,
+        'twist_slice_pruning': _build_pruning_table(N_TWIST, N_SLICE, twist_move, slice_move, 0, (SLICE_GOAL,)),
+        'flip_slice_pruning': _build_pruning_table(N_FLIP, N_SLICE, flip_move, slice_move, 0, (SLICE_GOAL,)),
+        'corner_slice_pruning': _build_pruning_table(
+            N_CORNER_PERMUTATION, N_SLICE_PERMUTATION, corner_move, slice_permutation_move, 0, (0,), PHASE2_MOVES
+        ),
+        'edge_slice_pruning': _build_pruning_table(
+            N_UD_EDGES, N_SLICE_PERMUTATION, ud_edges_move, slice_permutation_move, 0, (0,), PHASE2_MOVES
+        ),
+    }
+
+
+TABLES = TableSet('twophase', TABLE_VERSION, build_tables)
+
+
+class TwoPhaseTables:
+    """
+    Move and pruning tables for the two-phase solver, as flat typed views over the shared table file.
+
+    Phase 1 works on corner twist, edge flip, and slice edge positions and brings the cube into <U, D, R2, L2, F2, B2>.
+    Phase 2 works on corner permutation, U and D edge permutation, and slice edge permutation and solves the cube within that group.
+    """
+    def __init__(self, tables: Dict[str, Sequence[int]]):
+        self.twist_move = tables['twist_move']
+        self.flip_move = tables['flip_move']
+        self.slice_move = tables['slice_move']
+        self.corner_move = tables['corner_move']
+        self.ud_edges_move = tables['ud_edges_move']
+        self.slice_permutation_move = tables['slice_permutation_move']
+        self.twist_slice_pruning = tables['twist_slice_pruning']
+        self.flip_slice_pruning = tables['flip_slice_pruning']
+        self.corner_slice_pruning = tables['corner_slice_pruning']
+        self.edge_slice_pruning = tables['edge_slice_pruning']
+
+
+class TwoPhaseSolver:
+    """
+    Kociemba's two-phase algorithm: an IDA* search for a phase 1 solution, then for each one found an IDA* search that finishes the cube
+    in phase 2. The search keeps going for shorter solutions until one is at most target_length moves or the time budget runs out.
+    """
+    def __init__(self, tables: TwoPhaseTables):
+        self._tables = tables
+
+    def solve(self, cube: CubieCube, target_length: int = 22, max_length: int = 30, timeout: float = 1.0) -> str:
+        """ Return a move string solving the cube, or raise TamperedCube if the cube cannot be solved. """
+        # An unsolvable cube would send the search through every depth
+        if not cube.solvable:
+            raise TamperedCube(cube.to_string())
+
+        self._cube = cube
+        self._deadline = time.monotonic() + timeout
+        self._best = None
+        self._bound = max_length
+        self._target_length = target_length
+        self._phase1_moves = []
+        self._phase2_moves = []
+
+        twist, flip, slice_coordinate = cube.twist, cube.flip, slice_sorted(cube.ep) // N_SLICE_PERMUTATION
+        depth = self._phase1_heuristic(twist, flip, slice_coordinate)
+        while depth <= PHASE1_MAX_DEPTH and depth <= self._bound and not self._finished():
+            self._phase1(twist, flip, slice_coordinate, depth, None)
+            depth += 1
+
+        if self._best is None:
+            raise TamperedCube(cube.to_string())
+        return format_moves(self._best)
+
+    def _finished(self) -> bool:
+        return (self._best is not None and len(self._best) <= self._target_length) or \
+            (self._best is not None and time.monotonic() > self._deadline)
+
+    def _phase1_heuristic(self, twist: int, flip: int, slice_coordinate: int) -> int:
+        tables = self._tables
+        return max(
+            tables.twist_slice_pruning[twist * N_SLICE + slice_coordinate],
+            tables.flip_slice_pruning[flip * N_SLICE + slice_coordinate]
+        )
+
+    def _phase1(self, twist: int, flip: int, slice_coordinate: int, depth: int, previous: Optional[int]):
+        if depth == 0:
+            # Solutions ending in a phase 2 move were already found one move shorter
+            if not self._phase1_moves or self._phase1_moves[-1] not in PHASE2_MOVES:
+                self._start_phase2()
+            return
+        tables = self._tables
+        twist_move, twist_row = tables.twist_move, twist * N_MOVES
+        flip_move, flip_row = tables.flip_move, flip * N_MOVES
+        slice_move, slice_row = tables.slice_move, slice_coordinate * N_MOVES
+        twist_pruning = tables.twist_slice_pruning
+        flip_pruning = tables.flip_slice_pruning
+        for face in ALLOWED_FACES[previous]:
+            for code in range(face * 3, face * 3 + 3):
+                new_slice = slice_move[slice_row + code]
+                new_twist = twist_move[twist_row + code]
+                if twist_pruning[new_twist * N_SLICE + new_slice] >= depth:
+                    continue
+                new_flip = flip_move[flip_row + code]
+                if flip_pruning[new_flip * N_SLICE + new_slice] >= depth:
+                    continue
+                self._phase1_moves.append(code)
+                self._phase1(new_twist, new_flip, new_slice, depth - 1, face)
+                self._phase1_moves.pop()
+                if self._finished():
+                    return
+
+    def _start_phase2(self):
+        cube = self._cube
+        for code in self._phase1_moves:
+            cube = cube.multiply(MOVE_CUBIES[code])
+        corner, edges, slice_permutation = cube.corner_permutation, ud_edges(cube.ep), slice_sorted(cube.ep) % N_SLICE_PERMUTATION
+
+        limit = min(self._bound - len(self._phase1_moves), PHASE2_MAX_DEPTH)
+        depth = self._phase2_heuristic(corner, edges, slice_permutation)
+        previous = self._phase1_moves[-1] // 3 if self._phase1_moves else None
+        while depth <= limit:
+            if self._phase2(corner, edges, slice_permutation, depth, previous):
+                self._best = self._phase1_moves + self._phase2_moves
+                self._bound = len(self._best) - 1
+                self._phase2_moves = []
+                return
+            depth += 1
+
+    def _phase2_heuristic(self, corner: int, edges: int, slice_permutation: int) -> int:
+        tables = self._tables
+        return max(
+            tables.corner_slice_pruning[corner * N_SLICE_PERMUTATION + slice_permutation],
+            tables.edge_slice_pruning[edges * N_SLICE_PERMUTATION + slice_permutation]
+        )
+
+    def _phase2(self, corner: int, edges: int, slice_permutation: int, depth: int, previous: Optional[int]) -> bool:
+        if depth == 0:
+            return corner == 0 and edges == 0 and slice_permutation == 0
+        tables = self._tables
+        corner_move, corner_row = tables.corner_move, corner * N_MOVES
+        edges_move, edges_row = tables.ud_edges_move, edges * N_MOVES
+        slice_move, slice_row = tables.slice_permutation_move, slice_permutation * N_MOVES
+        corner_pruning = tables.corner_slice_pruning
+        edge_pruning = tables.edge_slice_pruning
+        for face in ALLOWED_FACES[previous]:
+            for code in PHASE2_FACE_MOVES[face]:
+                new_slice = slice_move[slice_row + code]
+                new_corner = corner_move[corner_row + code]
+                if corner_pruning[new_corner * N_SLICE_PERMUTATION + new_slice] >= depth:
+                    continue
+                new_edges = edges_move[edges_row + code]
+                if edge_pruning[new_edges * N_SLICE_PERMUTATION + new_slice] >= depth:
+                    continue
+                self._phase2_moves.append(code)
+                if self._phase2(new_corner, new_edges, new_slice, depth - 1, face):
+                    return True
+                self._phase2_moves.pop()
+        return False
+
+
+_tables = None
+
+
+def get_tables(timeout: Optional[float] = None) -> TwoPhaseTables:
+    """ Tables are mapped from the table file on first use, or generated in the background if the file does not exist yet.
+        Callers wait at most timeout seconds, by default RUBIK_TABLES_TIMEOUT, and get TablesNotReady while generation goes on.
+    """
+    global _tables
+    if _tables is None:
+        tables = TABLES.load(load_timeout() if timeout is None else timeout)
+        if tables is None:
+            raise TablesNotReady(TABLES.name)
+        _tables = TwoPhaseTables(tables)
+    return _tables
+
+
+def solve(cube: Cube, target_length: int = 22, timeout: float = 1.0) -> str:
+    """ Solve a cube with the two-phase algorithm, returning a complete solution as a move string. """
+    cubie = CubieCube.from_cube(cube)
+    if cubie == SOLVED_CUBIE:
+        return ''
+    return TwoPhaseSolver(get_tables()).solve(cubie, target_length=target_length, timeout=timeout)
@@ -63,6 +63,26 @@ class InvalidCubeCorner(InvalidCubeConfiguration):
         super().__init__(f'the cube does not contain a valid arrangement of corner pieces', problem_cube)
 
 
+class InvalidCubeDuplicatePieces(InvalidCubeConfiguration):
+    def __init__(self, problem_cube):
+        super().__init__(f'the cube contains the same piece more than once', problem_cube)
+
+
+class InvalidCubeTwist(InvalidCubeConfiguration):
+    def __init__(self, problem_cube):
+        super().__init__(f'a corner piece has been twisted', problem_cube)
+
+
+class InvalidCubeFlip(InvalidCubeConfiguration):
+    def __init__(self, problem_cube):
+        super().__init__(f'an edge piece has been flipped', problem_cube)
+
+
+class InvalidCubeParity(InvalidCubeConfiguration):
+    def __init__(self, problem_cube):
+        super().__init__(f'two pieces have been swapped', problem_cube)
+
+
 class TamperedCube(InvalidCubeConfiguration):
     def __init__(self, problem_cube):
         super().__init__(f'check that the cube has not been tampered with', problem_cube)
@@ -90,16 +110,19 @@ class MissingCube(SolveError):
 class InvalidRotateCommand(SolveError):
     def __init__(self, problem_cube, rotate_command):
         super().__init__("error: the rotate command is invalid", problem_cube, rotate_command)
-        
-        
-class FaceAlreadySolved(SolveError):
-    """ Exception to be thrown when we need to bubble up a request to skip the current face. """
-    def __init__(self):
-        super().__init__("pass: face already solved", None, None)
 
 
-class PhaseAlreadySolved(SolveError):
-    """ Exception to be thrown when we need to bubble up a request to skip the current phase. """
-    def __init__(self):
-        super().__init__("pass: phase already solved", None, None)
+class InvalidSolveMethod(SolveError):
+    def __init__(self, problem_cube, method):
+        super().__init__("error: the solve method is invalid", problem_cube, method)
+
+
+class SearchLimitExceeded(SolveError):
+    def __init__(self, problem_cube, nodes):
+        super().__init__(f"error: the search gave up without a solution after {nodes} nodes", problem_cube, None)
+
+
 
+class TablesNotReady(SolveError):
+    def __init__(self, name):
+        super().__init__(f"error: the {name} tables are not ready, try again later", None, None)
@@ -0,0 +1,93 @@
+import numpy as np
+from typing import Iterable, List, Union
+
+from rubik.cube import (
+    CUBE_FACES, CUBE_FACE_PIECES, CUBE_PIECES, FACE_CENTERS, MOVE_TABLES, PieceType,
+    ADJACENCY_ARRANGEMENTS, CompiledMoves, compile_moves
+)
+
+# Move tables as an index array, one row per move code
+MOVE_ARRAYS = np.array(MOVE_TABLES, dtype=np.intp)
+
+# The solved cube as face indexes, which is what every remapped cube is compared against
+SOLVED = np.repeat(np.arange(CUBE_FACES, dtype=np.uint8), CUBE_FACE_PIECES)
+
+# Marks a facelet whose color does not match any center
+UNMAPPED = 255
+
+# Facelet indexes of every corner and edge piece, grouped per piece in arrangement order
+CORNER_ELEMENTS = np.array(
+    sorted({tuple(arrangement.true_indexes) for arrangement in ADJACENCY_ARRANGEMENTS.values() if arrangement.piece_type == PieceType.CORNER.value}),
+    dtype=np.intp
+)
+EDGE_ELEMENTS = np.array(
+    sorted({tuple(arrangement.true_indexes) for arrangement in ADJACENCY_ARRANGEMENTS.values() if arrangement.piece_type == PieceType.EDGE.value}),
+    dtype=np.intp
+)
+
+# Face sets are compared as bitmasks, any set that names an arrangement is accepted the same way Cube._add_piece accepts it
+VALID_ADJACENCY_MASKS = np.array(sorted(sum(1 << face for face in adjacencies) for adjacencies in ADJACENCY_ARRANGEMENTS), dtype=np.int64)
+
+
+class CubeBatch:
+    """
+    Holds N cubes as an (N, 54) uint8 array of face indexes and applies moves to all of them with a single fancy-index operation.
+    The facelet layout and color to face remapping match rubik.cube.Cube, so results can be checked against the scalar path.
+    """
+    def __init__(self, facelets: np.ndarray):
+        self.facelets = facelets
+
+    @classmethod
+    def from_strings(cls, cubes: Iterable[str]) -> 'CubeBatch':
+        """ Encode cube strings, remapping each color to the index of the face whose center shares it (see Cube._remap_pieces).
+            Colors that match no center are stored as UNMAPPED so that they fail the validity check.
+        """
+        raw = np.array([np.frombuffer(cube.encode('ascii'), dtype=np.uint8) for cube in cubes], dtype=np.uint8).reshape(-1, CUBE_PIECES)
+        centers = raw[:, FACE_CENTERS]
+        facelets = np.full(raw.shape, UNMAPPED, dtype=np.uint8)
+
+        # Assign in reverse so that a color repeated across centers maps to its first center, which the validity check rejects anyway
+        for face in reversed(range(CUBE_FACES)):
+            facelets[raw == centers[:, face:face + 1]] = face
+        return cls(facelets)
+
+    def to_strings(self, colors: str = '012345') -> List[str]:
+        """ Decode each cube back into a string, using one color character per face. """
+        lookup = np.frombuffer(colors.encode('ascii'), dtype=np.uint8)
+        return [row.tobytes().decode('ascii') for row in lookup[self.facelets]]
+
+    def rotate(self, moves: Union[int, str, CompiledMoves]) -> 'CubeBatch':
+        """ Apply a move code, a move string, or a compiled sequence to every cube at once, in place. """
+        if isinstance(moves, str):
+            moves = compile_moves(moves)
+        table = MOVE_ARRAYS[moves] if isinstance(moves, int) else np.asarray(moves.table, dtype=np.intp)
+        self.facelets = self.facelets[:, table]
+        return self
+
+    @property
+    def solved(self) -> np.ndarray:
+        """ A boolean per cube that is true when every face shows a single color. """
+        return np.all(self.facelets == SOLVED, axis=1)
+
+    @property
+    def valid(self) -> np.ndarray:
+        """ A boolean per cube mirroring the checks made when constructing a Cube: six unique centers, every color matching a center,
+            nine facelets of every color, and edges and corners whose colors name a real piece.
+        """
+        facelets = self.facelets
+        centers = facelets[:, FACE_CENTERS]
+        valid = np.all(centers == np.arange(CUBE_FACES, dtype=np.uint8), axis=1)
+        valid &= np.all(facelets != UNMAPPED, axis=1)
+
+        # Guard against UNMAPPED values before using the faces as shift amounts
+        faces = np.where(facelets == UNMAPPED, 0, facelets).astype(np.int64)
+        counts = np.stack([np.count_nonzero(facelets == face, axis=1) for face in range(CUBE_FACES)], axis=1)
+        valid &= np.all(counts == CUBE_FACE_PIECES, axis=1)
+
+        for elements in (CORNER_ELEMENTS, EDGE_ELEMENTS):
+            masks = np.bitwise_or.reduce(np.left_shift(1, faces[:, elements]), axis=2)
+            valid &= np.all(np.isin(masks, VALID_ADJACENCY_MASKS), axis=1)
+        return valid
+
+    def __len__(self):
+        return self.facelets.shape[0]